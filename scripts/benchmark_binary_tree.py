@@ -0,0 +1,79 @@
+import src.containers as containers
+import random
+import time
+
+
+def build_tree(tree_class, keys: list[float]):
+    """
+    Builds a tree of given class from the keys and returns it with the elapsed time.
+    """
+    time_start = time.perf_counter()
+    tree = tree_class()
+    for key in keys:
+        tree.add_value(key)
+    return tree, time.perf_counter() - time_start
+
+
+def find_all(tree, keys: list[float]) -> float:
+    """
+    Looks up all keys in the tree and returns the elapsed time.
+    """
+    time_start = time.perf_counter()
+    for key in keys:
+        tree.find_value(key)
+    return time.perf_counter() - time_start
+
+
+def remove_all(tree, keys: list[float]) -> float:
+    """
+    Removes all keys from the tree and returns the elapsed time.
+    """
+    time_start = time.perf_counter()
+    for key in keys:
+        tree.remove_value(key)
+    return time.perf_counter() - time_start
+
+
+if __name__ == '__main__':
+    sizes = [500, 900, 100_000]
+    # the unbalanced tree degenerates to a chain on sorted streams, building it takes O(n^2)
+    max_chain_size = 10_000
+
+    for num_elements in sizes:
+        streams = {
+            "sorted": list(range(num_elements)),
+            "reversed": list(range(num_elements, 0, -1)),
+            "random": random.sample(range(10 * num_elements), num_elements),
+        }
+
+        for stream_name, keys in streams.items():
+            for tree_class in [containers.BinaryTree, containers.AVLTree]:
+                label = f"{tree_class.__name__:<10} {stream_name:<8} n={num_elements:<8}"
+                if tree_class is containers.BinaryTree and stream_name != "random" \
+                        and num_elements > max_chain_size:
+                    print(label + " skipped, degenerate chain")
+                    continue
+
+                tree, time_build = build_tree(tree_class, keys)
+                time_find = find_all(tree, keys)
+                time_remove = remove_all(tree, keys)
+
+                print(label + f" build {time_build:.4f} s, find {time_find:.4f} s, remove {time_remove:.4f} s")
+
+    # bulk load compared with adding the values one by one
+    num_elements = 100_000
+    keys = random.sample(range(10 * num_elements), num_elements)
+    for tree_class in [containers.BinaryTree, containers.AVLTree]:
+        _, time_build = build_tree(tree_class, keys)
+        time_start = time.perf_counter()
+        tree = tree_class.from_iterable(keys)
+        time_bulk = time.perf_counter() - time_start
+
+        other = tree_class.from_iterable(random.sample(range(10 * num_elements), num_elements))
+        time_start = time.perf_counter()
+        tree.union(other)
+        time_union = time.perf_counter() - time_start
+        print(f"{tree_class.__name__:<10} n={num_elements}: from_iterable {time_bulk:.4f} s "
+              f"(add_value {time_build:.4f} s), union {time_union:.4f} s")
+
+    print("***")
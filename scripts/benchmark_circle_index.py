@@ -0,0 +1,66 @@
+import math
+import random
+import time
+
+import src.simpleobjects as smobj
+
+
+def random_circles(count: int) -> list[smobj.Circle]:
+    """
+    Returns circles of radius up to 1 spread over a square, the density does not depend on the count.
+    """
+    side = 2.0 * math.sqrt(count)
+    return [smobj.Circle(smobj.Vector2d(random.uniform(0.0, side), random.uniform(0.0, side)),
+                         random.uniform(0.1, 1.0))
+            for _ in range(count)]
+
+
+def brute_containing(circles: list[smobj.Circle], point: smobj.Vector2d) -> list[smobj.Circle]:
+    """
+    Checks all circles one by one.
+    """
+    return [circle for circle in circles if circle.is_inside(point)]
+
+
+def brute_nearest(circles: list[smobj.Circle], point: smobj.Vector2d) -> smobj.Circle:
+    """
+    Computes the boundary distance to all circles.
+    """
+    return min(circles, key=lambda circle: abs(circle.distance_from_center(point) - circle.radius))
+
+
+def measure(function, *args) -> float:
+    """
+    Returns the elapsed time of the function.
+    """
+    time_start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - time_start
+
+
+if __name__ == '__main__':
+    random.seed(0)
+
+    for count in [1_000, 10_000, 100_000, 1_000_000]:
+        circles = random_circles(count)
+        side = 2.0 * math.sqrt(count)
+        points = [smobj.Vector2d(random.uniform(0.0, side), random.uniform(0.0, side)) for _ in range(1_000)]
+        # brute force is too slow for all the points with many circles
+        brute_points = points[:max(3, 100_000 // count)]
+
+        time_start = time.perf_counter()
+        index = smobj.CircleIndex(circles)
+        time_build = time.perf_counter() - time_start
+
+        time_brute = measure(lambda: [brute_containing(circles, point) for point in brute_points])
+        time_index = measure(lambda: [index.circles_containing(point) for point in brute_points])
+        print(f"n={count:<8} build {time_build:.3f} s")
+        print(f"  circles_containing x{len(brute_points):<5} brute {time_brute:.4f} s, index {time_index:.4f} s")
+
+        time_brute = measure(lambda: [brute_nearest(circles, point) for point in brute_points])
+        time_index = measure(lambda: [index.nearest_circle(point) for point in brute_points])
+        print(f"  nearest_circle     x{len(brute_points):<5} brute {time_brute:.4f} s, index {time_index:.4f} s")
+
+        print(f"  any_contains       x{len(points):<5} index {measure(index.any_contains, points):.4f} s")
+
+    print("***")
@@ -0,0 +1,63 @@
+import src.containers as containers
+import collections
+import random
+import time
+
+
+def queue_workload(container, num_operations: int) -> float:
+    """
+    Pushes and pops values on both ends of the container and returns the elapsed time.
+    """
+    time_start = time.perf_counter()
+    for idx in range(num_operations):
+        container.append(idx)
+        container.appendleft(idx)
+    for _ in range(num_operations):
+        container.pop()
+        container.popleft()
+    return time.perf_counter() - time_start
+
+
+def remove_workload_list(num_elements: int, num_removals: int) -> float:
+    """
+    Removes random elements from the doubly linked list using stored element handles.
+    """
+    linked_list = containers.DoublyLinkedList()
+    handles = [linked_list.append(idx) for idx in range(num_elements)]
+    random.shuffle(handles)
+
+    time_start = time.perf_counter()
+    for handle in handles[:num_removals]:
+        linked_list.remove_element(handle)
+    return time.perf_counter() - time_start
+
+
+def remove_workload_deque(num_elements: int, num_removals: int) -> float:
+    """
+    Removes random values from the deque, which must search for them.
+    """
+    container = collections.deque(range(num_elements))
+    values = list(range(num_elements))
+    random.shuffle(values)
+
+    time_start = time.perf_counter()
+    for value in values[:num_removals]:
+        container.remove(value)
+    return time.perf_counter() - time_start
+
+
+if __name__ == '__main__':
+    num_operations = 200_000
+    time_list = queue_workload(containers.DoublyLinkedList(), num_operations)
+    time_deque = queue_workload(collections.deque(), num_operations)
+    print(f"append/appendleft/pop/popleft x{num_operations}: "
+          f"DoublyLinkedList {time_list:.4f} s, deque {time_deque:.4f} s")
+
+    num_elements = 100_000
+    num_removals = 1_000
+    time_list = remove_workload_list(num_elements, num_removals)
+    time_deque = remove_workload_deque(num_elements, num_removals)
+    print(f"remove {num_removals} of {num_elements} elements: "
+          f"DoublyLinkedList {time_list:.4f} s, deque {time_deque:.4f} s")
+
+    print("***")
@@ -0,0 +1,48 @@
+import src.simplefuncs as smfc
+import time
+
+
+def measure(function, num: int) -> tuple[float, int | str]:
+    """
+    Returns the elapsed time and the result of the function, or the error name if it failed.
+    """
+    time_start = time.perf_counter()
+    try:
+        result = function(num)
+    except (OverflowError, RecursionError) as error:
+        return time.perf_counter() - time_start, type(error).__name__
+    return time.perf_counter() - time_start, result
+
+
+if __name__ == '__main__':
+    implementations = {
+        "recursion": smfc.fib_number_recursion,
+        "cyclus": smfc.fib_number_cyclus,
+        "close": smfc.fib_number_close,
+        "fib": smfc.fib,
+    }
+    # exponential recursion is measured only for small numbers
+    max_recursion_num = 27
+
+    for num in [20, 27, 70, 80, 1_000, 1_500, 100_000, 1_000_000]:
+        smfc.fib.cache_clear()
+        exact = smfc.fib(num)
+        smfc.fib.cache_clear()
+
+        for name, function in implementations.items():
+            if name == "recursion" and num > max_recursion_num:
+                continue
+            if name == "cyclus" and num > 100_000:
+                continue
+
+            elapsed, result = measure(function, num)
+            status = result if isinstance(result, str) else ("exact" if result == exact else "WRONG")
+            print(f"{name:<10} n={num:<9} {elapsed:.6f} s  {status}")
+        print("")
+
+    time_start = time.perf_counter()
+    for _ in smfc.fib_range(100_000, 110_000):
+        pass
+    print(f"fib_range(100000, 110000): {time.perf_counter() - time_start:.4f} s")
+
+    print("***")
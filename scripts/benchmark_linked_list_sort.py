@@ -0,0 +1,55 @@
+import src.containers as containers
+import random
+import time
+
+
+def build_list(values: list[float]) -> containers.LinkedList:
+    """
+    Builds a linked list containing the values in the given order.
+    """
+    linked_list = containers.LinkedList()
+    for value in values:
+        linked_list.add_last(value)
+    return linked_list
+
+
+def time_bubble_sort(values: list[float]) -> float:
+    linked_list = build_list(values)
+    time_start = time.perf_counter()
+    linked_list.bubble_sort()
+    return time.perf_counter() - time_start
+
+
+def time_merge_sort(values: list[float]) -> float:
+    linked_list = build_list(values)
+    time_start = time.perf_counter()
+    linked_list.sort()
+    return time.perf_counter() - time_start
+
+
+def time_builtin_sorted(values: list[float]) -> float:
+    linked_list = build_list(values)
+    time_start = time.perf_counter()
+    # copy values out, sort them and build a new list
+    build_list(sorted(item.value for item in linked_list))
+    return time.perf_counter() - time_start
+
+
+if __name__ == '__main__':
+    # bubble sort is quadratic, it is measured only for small lists
+    max_bubble_elements = 2_000
+
+    for num_elements in [1_000, 2_000, 10_000, 100_000]:
+        values = [random.random() for _ in range(num_elements)]
+
+        results = {
+            "sort": time_merge_sort(values),
+            "sorted(list)": time_builtin_sorted(values),
+        }
+        if num_elements <= max_bubble_elements:
+            results["bubble_sort"] = time_bubble_sort(values)
+
+        line = ", ".join(f"{name} {elapsed:.4f} s" for name, elapsed in results.items())
+        print(f"n={num_elements:<8} {line}")
+
+    print("***")
@@ -0,0 +1,75 @@
+import src.containers as containers
+import random
+import time
+import tracemalloc
+
+
+class DictListElement(containers.ListElement):
+    """
+    List element with instance dictionary, i.e. the layout without __slots__.
+    """
+
+
+class DictLinkedList(containers.LinkedList):
+    element_class = DictListElement
+
+
+class DictBinaryNode(containers.BinaryNode):
+    """
+    Binary node with instance dictionary, i.e. the layout without __slots__.
+    """
+
+
+class DictBinaryTree(containers.BinaryTree):
+    node_class = DictBinaryNode
+
+
+class DictAVLNode(containers.AVLNode):
+    """
+    AVL node with instance dictionary, i.e. the layout without __slots__.
+    """
+
+
+class DictAVLTree(containers.AVLTree):
+    node_class = DictAVLNode
+
+
+def measure(container_class, method_name: str, values: list[float]) -> tuple[float, float]:
+    """
+    Builds the container from the values and returns memory per element in bytes and build time in seconds.
+    """
+    tracemalloc.start()
+    memory_start, _ = tracemalloc.get_traced_memory()
+    time_start = time.perf_counter()
+
+    container = container_class()
+    add_method = getattr(container, method_name)
+    for value in values:
+        add_method(value)
+
+    time_build = time.perf_counter() - time_start
+    memory_end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (memory_end - memory_start) / len(values), time_build
+
+
+if __name__ == '__main__':
+    num_elements = 100_000
+    # values are created in advance so that only the nodes are measured
+    values = [random.random() for _ in range(num_elements)]
+
+    layouts = [
+        ("LinkedList", "__slots__", containers.LinkedList, "add_last"),
+        ("LinkedList", "__dict__", DictLinkedList, "add_last"),
+        ("BinaryTree", "__slots__", containers.BinaryTree, "add_value"),
+        ("BinaryTree", "__dict__", DictBinaryTree, "add_value"),
+        ("AVLTree", "__slots__", containers.AVLTree, "add_value"),
+        ("AVLTree", "__dict__", DictAVLTree, "add_value"),
+    ]
+
+    for container_name, layout_name, container_class, method_name in layouts:
+        memory_per_element, time_build = measure(container_class, method_name, values)
+        print(f"{container_name:<10} {layout_name:<9} n={num_elements}: "
+              f"{memory_per_element:.1f} B/element, build {time_build:.4f} s")
+
+    print("***")
@@ -0,0 +1,43 @@
+from src.backend import np
+from src.simplefuncs import find_value_in_ordered_list, min_of_list
+from src.sort_algs import quick_sort
+import random
+import time
+
+
+def measure(function, *args) -> float:
+    time_start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - time_start
+
+
+if __name__ == '__main__':
+    if np is None:
+        print("NumPy is not installed, only the pure Python path is available.")
+        raise SystemExit
+
+    num_values = 10_000_000
+    values = [random.random() for _ in range(num_values)]
+    array_values = np.array(values)
+
+    time_list = measure(min_of_list, values)
+    time_array = measure(min_of_list, array_values)
+    print(f"min_of_list        n={num_values}: list {time_list:.4f} s, "
+          f"ndarray {time_array:.4f} s, speedup {time_list / time_array:.0f}x")
+
+    # pure Python quick sort of 10M values takes minutes, smaller input is used for it
+    num_sorted = 1_000_000
+    time_list = measure(quick_sort, values[:num_sorted])
+    time_array = measure(quick_sort, array_values[:num_sorted].copy())
+    print(f"quick_sort         n={num_sorted}: list {time_list:.4f} s, "
+          f"ndarray {time_array:.4f} s, speedup {time_list / time_array:.0f}x")
+
+    values.sort()
+    array_values.sort()
+    queries = random.sample(values, 10_000)
+    time_list = measure(lambda: [find_value_in_ordered_list(query, values) for query in queries])
+    time_array = measure(lambda: [find_value_in_ordered_list(query, array_values) for query in queries])
+    print(f"find_value_in_ordered_list {len(queries)} queries, n={num_values}: list {time_list:.4f} s, "
+          f"ndarray {time_array:.4f} s, speedup {time_list / time_array:.1f}x")
+
+    print("***")
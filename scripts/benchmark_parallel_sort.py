@@ -0,0 +1,36 @@
+from array import array
+from src.sort_algs import parallel_sort, quick_sort
+import os
+import random
+import time
+
+
+if __name__ == '__main__':
+    num_values = 2_000_000
+    values = [random.random() for _ in range(num_values)]
+
+    lst = values.copy()
+    time_start = time.perf_counter()
+    quick_sort(lst)
+    time_python = time.perf_counter() - time_start
+    print(f"quick_sort(list)  n={num_values}: {time_python:.3f} s")
+
+    # single process baseline of the parallel path: copy to doubles, sort by quick_sort (NumPy), copy back
+    lst = values.copy()
+    time_start = time.perf_counter()
+    doubles = array("d", lst)
+    quick_sort(doubles)
+    lst[:] = doubles
+    time_serial = time.perf_counter() - time_start
+    print(f"quick_sort(array) n={num_values}: {time_serial:.3f} s")
+
+    max_workers = os.cpu_count() or 1
+    for workers in range(2, max_workers + 1):
+        lst = values.copy()
+        time_start = time.perf_counter()
+        parallel_sort(lst, workers=workers)
+        time_parallel = time.perf_counter() - time_start
+        print(f"parallel_sort({workers:>2}) n={num_values}: {time_parallel:.3f} s, "
+              f"speedup {time_serial / time_parallel:.2f}x")
+
+    print("***")
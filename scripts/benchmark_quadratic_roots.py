@@ -0,0 +1,50 @@
+import random
+import time
+from array import array
+
+import src.simplefuncs as smfc
+from src.backend import np
+
+
+def random_coefficients(count: int) -> tuple[array, array, array]:
+    """
+    Returns random coefficients, about half of the equations have real roots.
+    """
+    a = array("d", (random.uniform(-10.0, 10.0) for _ in range(count)))
+    b = array("d", (random.uniform(-10.0, 10.0) for _ in range(count)))
+    c = array("d", (random.uniform(-10.0, 10.0) for _ in range(count)))
+    return a, b, c
+
+
+def loop_scalar(a, b, c) -> list[tuple[float, float]]:
+    """
+    Solves the equations one by one by the scalar function.
+    """
+    return [smfc.real_quadratic_roots(value_a, value_b, value_c) for value_a, value_b, value_c in zip(a, b, c)]
+
+
+def measure(function, *args) -> float:
+    """
+    Returns the elapsed time of the function.
+    """
+    time_start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - time_start
+
+
+if __name__ == '__main__':
+    random.seed(0)
+
+    for count in [10_000, 100_000, 1_000_000]:
+        a, b, c = random_coefficients(count)
+        print(f"n={count}")
+        print(f"  scalar loop:        {measure(loop_scalar, a, b, c):.4f} s")
+        print(f"  batch (pure):       {measure(smfc.real_quadratic_roots_many, list(a), list(b), list(c)):.4f} s")
+        if np is not None:
+            print(f"  batch (numpy):      {measure(smfc.real_quadratic_roots_many, *map(np.asarray, (a, b, c))):.4f} s")
+
+    # catastrophic cancellation of the textbook formula for b**2 >> 4ac
+    print("")
+    print("roots of x**2 + 1e8*x + 1:", smfc.real_quadratic_roots(1.0, 1e8, 1.0))
+
+    print("***")
@@ -0,0 +1,95 @@
+import random
+import time
+import tracemalloc
+
+import src.simpleobjects as smobj
+
+
+class DictVector2d(smobj.Vector2d):
+    """
+    Vector with instance dictionary, i.e. the layout without __slots__.
+    """
+
+
+class DictCircle(smobj.Circle):
+    """
+    Circle with instance dictionary, i.e. the layout without __slots__.
+    """
+
+
+def memory_per_object(factory, count: int) -> float:
+    """
+    Creates the objects and returns the allocated memory per object in bytes.
+    """
+    tracemalloc.start()
+    memory_start, _ = tracemalloc.get_traced_memory()
+    objects = [factory(idx) for idx in range(count)]
+    memory_end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return (memory_end - memory_start) / count
+
+
+def ops_per_second(function, count: int) -> float:
+    """
+    Calls the function for each index and returns number of calls per second.
+    """
+    time_start = time.perf_counter()
+    for idx in range(count):
+        function(idx)
+    return count / (time.perf_counter() - time_start)
+
+
+def nearest_point_temporaries(circle: smobj.Circle, point: smobj.Vector2d) -> smobj.Vector2d:
+    """
+    Nearest point on the circle computed by creating temporary vectors, the original implementation.
+    """
+    direction = point.minus(circle.center)
+    direction.normalize()
+    return direction.multiply(circle.radius).plus(circle.center)
+
+
+if __name__ == '__main__':
+    count = 100_000
+    # the coordinates are created in advance so that only the objects are measured
+    coordinates = [random.uniform(-10.0, 10.0) for _ in range(count + 1)]
+
+    print("memory per object:")
+    layouts = [
+        ("Vector2d", "__slots__", lambda idx: smobj.Vector2d(coordinates[idx], coordinates[idx + 1])),
+        ("Vector2d", "__dict__", lambda idx: DictVector2d(coordinates[idx], coordinates[idx + 1])),
+        ("Circle", "__slots__",
+         lambda idx: smobj.Circle(smobj.Vector2d(coordinates[idx], coordinates[idx + 1]), 1.0)),
+        ("Circle", "__dict__",
+         lambda idx: DictCircle(DictVector2d(coordinates[idx], coordinates[idx + 1]), 1.0)),
+    ]
+    for class_name, layout_name, factory in layouts:
+        print(f"  {class_name:<9} {layout_name:<9} {memory_per_object(factory, count):.1f} B")
+
+    points = [smobj.Vector2d(coordinates[idx], coordinates[idx + 1]) for idx in range(count)]
+    circle = smobj.Circle(smobj.Vector2d(0.5, -0.5), 2.0)
+    total = smobj.Vector2d(0.0, 0.0)
+    result = smobj.Vector2d()
+
+    def accumulate_plus(idx: int) -> None:
+        global total
+        total = total.plus(points[idx])
+
+    def accumulate_inplace(idx: int) -> None:
+        global total
+        total += points[idx]
+
+    benchmarks = [
+        ("sum by plus (new vector)", accumulate_plus),
+        ("sum by += (in place)", accumulate_inplace),
+        ("distance by minus().norm()", lambda idx: points[idx].minus(circle.center).norm()),
+        ("distance by hypot", lambda idx: points[idx].distance(circle.center)),
+        ("nearest_point_on, temporaries", lambda idx: nearest_point_temporaries(circle, points[idx])),
+        ("nearest_point_on", lambda idx: circle.nearest_point_on(points[idx])),
+        ("nearest_point_on(out=)", lambda idx: circle.nearest_point_on(points[idx], out=result)),
+    ]
+    print("operations per second:")
+    for name, function in benchmarks:
+        print(f"  {name:<32} {ops_per_second(function, count):,.0f}")
+
+    print("***")
@@ -0,0 +1,27 @@
+try:
+    import numpy as np
+except ImportError:
+    # NumPy is optional, pure Python implementations are used without it
+    np = None
+
+
+def as_ndarray(values):
+    """
+    Returns a NumPy array sharing the memory with the given values, nothing is copied.
+    :param values: NumPy array or any object supporting the buffer protocol (array.array, memoryview, ...)
+    :return: NumPy array or None for Python lists/tuples, unsupported objects or missing NumPy
+    """
+    if np is None:
+        return None
+
+    if isinstance(values, np.ndarray):
+        return values
+
+    if isinstance(values, (list, tuple)):
+        # lists cannot be shared, the pure Python path is used for them
+        return None
+
+    try:
+        return np.asarray(memoryview(values))
+    except TypeError:
+        return None
@@ -1,10 +1,13 @@
-import weakref
+import heapq
+import math
+import random
 
 
 class ListElement:
     """
     This class represents a single element in the linked list.
     """
+    __slots__ = ("value", "next")
 
     def __init__(self, value: float = float("nan"), next_element: "ListElement" = None):
         self.value: float = value
@@ -45,15 +48,186 @@ class LinkedListIterator:
         return current_item
 
 
+class SkipListNode:
+    """
+    This class represents a single node of the skip-list index.
+    """
+    __slots__ = ("element", "next", "down")
+
+    def __init__(self, element: ListElement | None = None, next_node: "SkipListNode" = None,
+                 down: "SkipListNode" = None):
+        # indexed list element, None for the head sentinel of the level
+        self.element: ListElement | None = element
+        self.next: SkipListNode | None = next_node
+        self.down: SkipListNode | None = down
+
+
+class SkipListIndex:
+    """
+    This class implements a probabilistic skip-list index over the elements of a sorted linked list.
+    The elements themselves form the lowest level, the index keeps the levels above it.
+    """
+
+    def __init__(self, probability: float = 0.5, max_level: int = 32, seed: int | None = None):
+        self.probability: float = probability
+        self.max_level: int = max_level
+        self._random = random.Random(seed)
+        # head sentinels of the index levels, from the lowest to the highest one
+        self.heads: list[SkipListNode] = []
+
+    def _random_level(self) -> int:
+        """
+        Draws the number of index levels for a new element.
+        @return: number of levels, 0 if the element is not indexed
+        """
+        level: int = 0
+        while level < self.max_level and self._random.random() < self.probability:
+            level += 1
+        return level
+
+    def _add_levels(self, num_levels: int) -> None:
+        """
+        Adds empty levels on top of the index so that it has at least the given number of levels.
+        @param num_levels: required number of levels
+        @return: None
+        """
+        while len(self.heads) < num_levels:
+            down: SkipListNode | None = self.heads[-1] if self.heads else None
+            self.heads.append(SkipListNode(down=down))
+
+    def clear(self) -> None:
+        """
+        Removes all the nodes from the index.
+        @return: None
+        """
+        self.heads = []
+
+    def build(self, head: ListElement | None) -> None:
+        """
+        Builds the index over the sorted chain of elements in O(n).
+        @param head: first element of the sorted list
+        @return: None
+        """
+        self.clear()
+        last_nodes: list[SkipListNode] = []
+        for element in LinkedListIterator(head):
+            level: int = self._random_level()
+            self._add_levels(level)
+            while len(last_nodes) < len(self.heads):
+                last_nodes.append(self.heads[len(last_nodes)])
+
+            down: SkipListNode | None = None
+            for idx in range(level):
+                node = SkipListNode(element=element, down=down)
+                last_nodes[idx].next = node
+                last_nodes[idx] = node
+                down = node
+
+    def find_predecessors(self, value: float, after_equal: bool = False) -> list[SkipListNode]:
+        """
+        Finds the last node before the given value on every level.
+        @param value: searched value
+        @param after_equal: whether to move past the nodes equal to the value
+        @return: predecessor nodes from the lowest to the highest level
+        """
+        predecessors: list[SkipListNode] = [None] * len(self.heads)
+        node: SkipListNode | None = None
+        for level in reversed(range(len(self.heads))):
+            node = self.heads[level] if node is None else node.down
+            while node.next is not None and (node.next.element.value < value
+                                             or after_equal and node.next.element.value == value):
+                node = node.next
+            predecessors[level] = node
+        return predecessors
+
+    def find_before(self, value: float, after_equal: bool = False) -> ListElement | None:
+        """
+        Returns an indexed element close before the given value, the list continues from there.
+        @param value: searched value
+        @param after_equal: whether to move past the elements equal to the value
+        @return: indexed element before the value or None if the search starts from the list head
+        """
+        if not self.heads:
+            return None
+        return self.find_predecessors(value, after_equal)[0].element
+
+    def insert(self, element: ListElement, after_equal: bool = False) -> None:
+        """
+        Indexes an element which was just linked into the sorted list.
+        @param element: new element of the list
+        @param after_equal: True if the element was linked after all elements with the same value
+        @return: None
+        """
+        level: int = self._random_level()
+        if level == 0:
+            return
+
+        self._add_levels(level)
+        predecessors = self.find_predecessors(element.value, after_equal)
+        down: SkipListNode | None = None
+        for idx in range(level):
+            node = SkipListNode(element=element, next_node=predecessors[idx].next, down=down)
+            predecessors[idx].next = node
+            down = node
+
+    def remove(self, element: ListElement) -> None:
+        """
+        Removes all index nodes of an element which is being removed from the list.
+        @param element: removed element of the list
+        @return: None
+        """
+        value: float = element.value
+        node: SkipListNode | None = None
+        for level in reversed(range(len(self.heads))):
+            node = self.heads[level] if node is None else node.down
+            while node.next is not None and node.next.element.value < value:
+                node = node.next
+
+            # several elements may have the same value, look for this one
+            probe: SkipListNode = node
+            while probe.next is not None and probe.next.element is not element \
+                    and probe.next.element.value == value:
+                probe = probe.next
+            if probe.next is not None and probe.next.element is element:
+                probe.next = probe.next.next
+
+        # drop empty levels from the top
+        while self.heads and self.heads[-1].next is None:
+            self.heads.pop()
+
+
 class LinkedList:
     """
     This class represents a linked list.
     """
+    # class of the elements created by the list
+    element_class = ListElement
 
-    def __init__(self):
+    def __init__(self, indexed: bool = False):
+        """
+        @param indexed: whether to keep a skip-list index while the list is sorted
+        """
         self.head: ListElement | None = None
         self.tail: ListElement | None = None
 
+        # running aggregates of the values, kept up to date by the add and remove methods
+        self._count: int = 0
+        self._sum: float = 0.0
+        self._sum_compensation: float = 0.0
+        self._sum_valid: bool = True
+        self._zero_count: int = 0
+        self._nonzero_prod: float = 1.0
+        self._prod_valid: bool = True
+        # extremes are recomputed lazily, None means unknown
+        self._min: float | None = None
+        self._max: float | None = None
+
+        # cached result of is_sorted, None means unknown
+        self._sorted: bool | None = True
+        # skip-list index exists only while the list is known to be sorted
+        self.indexed: bool = indexed
+        self._index: SkipListIndex | None = SkipListIndex() if indexed else None
+
     def __iter__(self) -> LinkedListIterator:
         """
         Iterates through the linked list.
@@ -61,6 +235,13 @@ class LinkedList:
         """
         return LinkedListIterator(self.head)
 
+    def __len__(self) -> int:
+        """
+        Returns the number of elements in the list.
+        @return: number of elements
+        """
+        return self._count
+
     def is_empty(self) -> bool:
         """
         Checks if the list is empty.
@@ -74,9 +255,10 @@ class LinkedList:
         @param value: new value to be added to the list
         @return: None
         """
-        new_element = ListElement(value=value)
+        new_element = self.element_class(value=value)
         self.head = new_element
         self.tail = new_element
+        self._element_inserted(new_element, previous=None, index_after_equal=True)
 
     def add_first(self, value: float) -> None:
         """
@@ -88,8 +270,9 @@ class LinkedList:
             self.add_to_empty(value)
             return
 
-        new_element = ListElement(value=value, next_element=self.head)
+        new_element = self.element_class(value=value, next_element=self.head)
         self.head = new_element
+        self._element_inserted(new_element, previous=None, index_after_equal=False)
 
     def add_last(self, value: float) -> None:
         """
@@ -101,9 +284,11 @@ class LinkedList:
             self.add_to_empty(value)
             return
 
-        new_element = ListElement(value=value)
+        previous: ListElement = self.tail
+        new_element = self.element_class(value=value)
         self.tail.next = new_element
         self.tail = new_element
+        self._element_inserted(new_element, previous=previous, index_after_equal=True)
 
     def to_string(self) -> str:
         """
@@ -135,14 +320,16 @@ class LinkedList:
         if self.is_empty():
             return
 
+        removed_element: ListElement = self.head
+
         # case when only a single item is in the list
         if self.head == self.tail:
             self.head = None
             self.tail = None
-            return
+        else:
+            self.head = self.head.next
 
-        self.head = self.head.next
-        return
+        self._element_removed(removed_element)
 
     def sum(self) -> float:
         """
@@ -152,10 +339,9 @@ class LinkedList:
         if self.is_empty():
             return float("nan")
 
-        total_sum: float = 0.0
-        for item in self:
-            total_sum += item.value
-        return total_sum
+        if not self._sum_valid:
+            self._recompute_aggregates()
+        return self._sum + self._sum_compensation
 
     def prod(self) -> float:
         """
@@ -165,10 +351,11 @@ class LinkedList:
         if self.is_empty():
             return float("nan")
 
-        total_sum: float = 1.0
-        for item in self:
-            total_sum *= item.value
-        return total_sum
+        if not self._prod_valid:
+            self._recompute_aggregates()
+        if self._zero_count > 0:
+            return 0.0
+        return self._nonzero_prod
 
     def min(self) -> float:
         """
@@ -178,11 +365,9 @@ class LinkedList:
         if self.is_empty():
             return float("nan")
 
-        current_min: float = float("inf")
-        for item in self:
-            if item.value < current_min:
-                current_min = item.value
-        return current_min
+        if self._min is None:
+            self._recompute_extremes()
+        return self._min
 
     def max(self) -> float:
         """
@@ -192,11 +377,9 @@ class LinkedList:
         if self.is_empty():
             return float("nan")
 
-        current_max: float = -float("inf")
-        for item in self:
-            if item.value > current_max:
-                current_max = item.value
-        return current_max
+        if self._max is None:
+            self._recompute_extremes()
+        return self._max
 
     def mean(self) -> float:
         """
@@ -206,13 +389,200 @@ class LinkedList:
         if self.is_empty():
             return float("nan")
 
-        item_counter: int = 0
-        total_sum: float = 0.0
+        return self.sum() / self._count
+
+    def _element_inserted(self, element: ListElement, previous: ListElement | None,
+                          index_after_equal: bool | None = None) -> None:
+        """
+        Updates the aggregates, the sorted flag and the index after an element was linked into the list.
+        @param element: new element of the list
+        @param previous: element before the new one or None if it is the head
+        @param index_after_equal: position of the element among equal values for the index,
+                                  None if the element should not be indexed
+        @return: None
+        """
+        self._value_added(element.value)
+
+        if self._sorted:
+            next_element: ListElement | None = element.next
+            if (previous is not None and previous.value > element.value) or \
+                    (next_element is not None and element.value > next_element.value):
+                self._set_sorted(False)
+
+        if self._index is not None and index_after_equal is not None:
+            self._index.insert(element, after_equal=index_after_equal)
+
+    def _element_removed(self, element: ListElement) -> None:
+        """
+        Updates the aggregates, the sorted flag and the index after an element was unlinked from the list.
+        @param element: removed element
+        @return: None
+        """
+        self._value_removed(element.value)
+
+        if self._index is not None:
+            self._index.remove(element)
+
+        if self.is_empty():
+            self._set_sorted(True)
+        elif self._sorted is False:
+            # removing an element may have made the list sorted
+            self._set_sorted(None)
+
+    def _set_sorted(self, is_sorted: bool | None) -> None:
+        """
+        Sets the cached sorted flag and keeps the index only while the list is sorted.
+        @param is_sorted: True or False if known, None if unknown
+        @return: None
+        """
+        self._sorted = is_sorted
+        if is_sorted is not True:
+            self._index = None
+        elif self.indexed and self._index is None:
+            self._index = SkipListIndex()
+            self._index.build(self.head)
+
+    def _use_sorted_search(self) -> bool:
+        """
+        Checks if the lookups can rely on the list being sorted.
+        @return: True if the list is known to be sorted
+        """
+        if self.indexed:
+            # index was requested, find out whether the list is sorted and build the index if needed
+            return self.is_sorted()
+        return self._sorted is True
+
+    def _find_before(self, value: float) -> ListElement | None:
+        """
+        Finds the last element with a value smaller than the given one in the sorted list.
+        @param value: searched value
+        @return: last element with smaller value or None if there is no such element
+        """
+        item: ListElement | None = None
+        if self._index is not None:
+            item = self._index.find_before(value)
+
+        candidate: ListElement | None = self.head if item is None else item.next
+        while candidate is not None and candidate.value < value:
+            item = candidate
+            candidate = candidate.next
+        return item
+
+    def _value_added(self, value: float) -> None:
+        """
+        Updates the running aggregates after a value was added to the list.
+        @param value: added value
+        @return: None
+        """
+        self._count += 1
+        self._add_to_sum(value)
+
+        if value == 0.0:
+            self._zero_count += 1
+        else:
+            self._nonzero_prod *= value
+
+        if self._count == 1:
+            # same start as the full scan, NaN never passes the comparisons and is skipped
+            self._min = float("inf")
+            self._max = -float("inf")
+        if self._min is not None and value < self._min:
+            self._min = value
+        if self._max is not None and value > self._max:
+            self._max = value
+
+    def _value_removed(self, value: float) -> None:
+        """
+        Updates the running aggregates after a value was removed from the list.
+        @param value: removed value
+        @return: None
+        """
+        self._count -= 1
+        if self._count == 0:
+            self._reset_aggregates()
+            return
+
+        self._add_to_sum(-value)
+
+        if value == 0.0:
+            self._zero_count -= 1
+        elif math.isfinite(value) and math.isfinite(self._nonzero_prod) and self._nonzero_prod != 0.0:
+            self._nonzero_prod /= value
+        else:
+            # product over/underflowed or contains inf/nan, division cannot undo the multiplication
+            self._prod_valid = False
+
+        # extremes are recomputed only when the current one or a NaN was removed
+        if value == self._min or value != value:
+            self._min = None
+        if value == self._max or value != value:
+            self._max = None
+
+    def _add_to_sum(self, value: float) -> None:
+        """
+        Adds the value to the running sum using Kahan-Babuska (Neumaier) compensated summation.
+        @param value: value to be added
+        @return: None
+        """
+        if not (math.isfinite(value) and math.isfinite(self._sum)):
+            # compensation does not work with inf/nan, the sum is recomputed on demand
+            self._sum_valid = False
+            return
+
+        total: float = self._sum + value
+        if abs(self._sum) >= abs(value):
+            self._sum_compensation += (self._sum - total) + value
+        else:
+            self._sum_compensation += (value - total) + self._sum
+        self._sum = total
+
+    def _reset_aggregates(self) -> None:
+        """
+        Sets all the running aggregates to the state of the empty list.
+        @return: None
+        """
+        self._count = 0
+        self._sum = 0.0
+        self._sum_compensation = 0.0
+        self._sum_valid = True
+        self._zero_count = 0
+        self._nonzero_prod = 1.0
+        self._prod_valid = True
+        self._min = None
+        self._max = None
+
+    def _recompute_aggregates(self) -> None:
+        """
+        Recomputes all the running aggregates by walking through the whole list.
+        @return: None
+        """
+        self._reset_aggregates()
         for item in self:
-            total_sum += item.value
-            item_counter += 1
+            self._value_added(item.value)
+
+        if not self._sum_valid:
+            # list contains inf/nan, plain sum gives the correct result
+            total_sum: float = 0.0
+            for item in self:
+                total_sum += item.value
+            self._sum = total_sum
+            self._sum_compensation = 0.0
+            self._sum_valid = True
 
-        return total_sum / item_counter
+    def _recompute_extremes(self) -> None:
+        """
+        Recomputes the minimal and the maximal value by walking through the whole list.
+        @return: None
+        """
+        current_min: float = float("inf")
+        current_max: float = -float("inf")
+        for item in self:
+            if item.value < current_min:
+                current_min = item.value
+            if item.value > current_max:
+                current_max = item.value
+        self._min = current_min
+        self._max = current_max
 
     def add_after(self, value: float, item: ListElement) -> None:
         """
@@ -228,17 +598,26 @@ class LinkedList:
         if self.is_empty():
             raise Exception
 
-        new_element = ListElement(value=value, next_element=item.next)
+        new_element = self.element_class(value=value, next_element=item.next)
         item.next = new_element
+        self._element_inserted(new_element, previous=item)
 
     def remove_after(self, item: ListElement) -> None:
         """
         Removes a value from the list after the given element.
-        @param item:
-        @return:
+        @param item: element after which to remove the value
+        @return: None
         """
-        # TODO: homework
-        return
+        if item is None or item.next is None:
+            # nothing to remove
+            return
+
+        removed_element: ListElement = item.next
+        item.next = removed_element.next
+        if removed_element == self.tail:
+            self.tail = item
+
+        self._element_removed(removed_element)
 
     def find_value(self, value: float) -> ListElement | None:
         """
@@ -246,7 +625,17 @@ class LinkedList:
         @param value: The number to be found
         @return: Element containing the value or None
         """
-        # TODO: homework
+        if self._use_sorted_search():
+            # the first element not smaller than the value is the only candidate
+            before: ListElement | None = self._find_before(value)
+            candidate: ListElement | None = self.head if before is None else before.next
+            if candidate is not None and candidate.value == value:
+                return candidate
+            return None
+
+        for item in self:
+            if item.value == value:
+                return item
         return None
 
     def remove_last(self) -> None:
@@ -254,16 +643,37 @@ class LinkedList:
         Removes the last element of the list.
         @return: None
         """
-        # TODO: homework
-        return
+        if self.is_empty():
+            return
+
+        if self.head == self.tail:
+            self.remove_first()
+            return
+
+        # singly linked list must be walked to find the element before the tail
+        for item in self:
+            if item.next == self.tail:
+                self.remove_after(item)
+                return
 
     def num_value(self, value: float) -> int:
         """
         Returns the number of elements with the given value.
         @return: number of elements with the given value
         """
-        # TODO: homework
-        return 0
+        counter: int = 0
+        if self._use_sorted_search():
+            # equal values are next to each other in the sorted list
+            item: ListElement | None = self.find_value(value)
+            while item is not None and item.value == value:
+                counter += 1
+                item = item.next
+            return counter
+
+        for item in self:
+            if item.value == value:
+                counter += 1
+        return counter
 
     def is_sorted(self) -> bool:
         """
@@ -271,18 +681,17 @@ class LinkedList:
         @return: True if the list is sorted, False otherwise
         """
 
-        if self.is_empty():
-            # empty list is always sorted
-            return True
-
-        if self.head == self.tail:
-            # list with a single value is always sorted
-            return True
+        if self._sorted is not None:
+            # result is known from the previous changes of the list
+            return self._sorted
 
         for item in self:
             # must check that item.next is not None and then compares the pair
             if item.next and item.value > item.next.value:
+                self._set_sorted(False)
                 return False
+
+        self._set_sorted(True)
         return True
 
     def add_sorted(self, value: float, enforce_sorted: bool = False) -> None:
@@ -308,6 +717,14 @@ class LinkedList:
             self.add_first(value)
             return
 
+        if self._use_sorted_search():
+            # index (if any) finds the place in O(log n)
+            previous: ListElement = self._find_before(value)
+            self.add_after(value, previous)
+            if self._index is not None:
+                self._index.insert(previous.next, after_equal=False)
+            return
+
         for item in self:
             if item.next and item.value <= value <= item.next.value:
                 self.add_after(value, item)
@@ -324,6 +741,9 @@ class LinkedList:
                 bubble_counter += 1
                 # switch values
                 item.value, item.next.value = item.next.value, item.value
+
+        # list is sorted if no pair was switched, unknown otherwise
+        self._set_sorted(True if bubble_counter == 0 else None)
         return bubble_counter
 
     def bubble_sort(self) -> None:
@@ -341,58 +761,317 @@ class LinkedList:
         while counter != 0:
             counter = self.single_bubble()
 
+    def sort(self, key=None, reverse: bool = False) -> None:
+        """
+        Sorts the list using bottom-up merge sort in O(n log n). Elements are relinked, not copied,
+        the sort is stable and needs O(1) extra memory.
+        @param key: function computing the comparison key from a value, values are compared if None
+        @param reverse: sort in descending order if True
+        @return: None
+        """
+        if self.head == self.tail:
+            # empty list or list with a single value is always sorted
+            return
 
-class BinaryNode:
+        width: int = 1
+        while width < len(self):
+            new_head: ListElement | None = None
+            new_tail: ListElement | None = None
+
+            remaining: ListElement | None = self.head
+            while remaining is not None:
+                # cut two neighbouring runs of the given width and merge them
+                left: ListElement = remaining
+                right: ListElement | None = _split_run(left, width)
+                remaining = _split_run(right, width)
+
+                merged_head, merged_tail = _merge_runs(left, right, key, reverse)
+                if new_tail is None:
+                    new_head = merged_head
+                else:
+                    new_tail.next = merged_head
+                new_tail = merged_tail
+
+            self.head = new_head
+            self.tail = new_tail
+            width *= 2
+
+        # relinked elements invalidate the index, it is rebuilt if the list is sorted by value
+        self._index = None
+        self._set_sorted(True if key is None and not reverse else None)
+
+
+class DoublyListElement(ListElement):
     """
-    Class representing a node in a binary tree.
+    This class represents a single element in the doubly linked list.
     """
-    def __init__(self, value: float = float("nan"), left=None, right=None, parent=None, tree=None):
-        self.left = left
-        self.right = right
-        self.value: float = value
+    __slots__ = ("prev", "owner")
 
-        self.parent = parent
-        self.tree: BinaryTree | None = tree
+    def __init__(self, value: float = float("nan"), next_element: "DoublyListElement" = None,
+                 prev_element: "DoublyListElement" = None):
+        super().__init__(value=value, next_element=next_element)
+        self.prev: DoublyListElement | None = prev_element
+        # list the element is linked in, None when it is not in any list
+        self.owner: DoublyLinkedList | None = None
 
-    @property
-    def parent(self):
-        # getter
-        if self._parent is None:
-            return None
-        # from weak reference to full
-        parent = self._parent()
-        if parent is not None:
-            return parent
-        raise LookupError("Deleted parent reference")
-
-    @parent.setter
-    def parent(self, new_parent) -> None:
-        # setter
-        if new_parent is None:
-            self._parent = None
+    def is_first(self) -> bool:
+        """
+        Checks if the element is first or not.
+        @return: returns true if the element is first, false otherwise
+        """
+        return self.prev is None
+
+
+class DoublyLinkedList(LinkedList):
+    """
+    This class represents a doubly linked list, elements know their predecessors,
+    so both ends and any given element can be removed in O(1).
+    """
+    element_class = DoublyListElement
+
+    def add_first(self, value: float) -> None:
+        """
+        Adds a value to the beginning of the list.
+        @param value: new value to be added to the list
+        @return: None
+        """
+        super().add_first(value)
+        if self.head.next is not None:
+            self.head.next.prev = self.head
+
+    def add_last(self, value: float) -> None:
+        """
+        Adds a value to the end of the list.
+        @param value: new value to be added to the list
+        @return: None
+        """
+        previous: DoublyListElement | None = self.tail
+        super().add_last(value)
+        self.tail.prev = previous
+
+    def add_after(self, value: float, item: DoublyListElement) -> None:
+        """
+        Adds a value to the list after the given element.
+        @param value: new value to be added
+        @param item: element after which to add the value
+        @return: None
+        """
+        super().add_after(value, item)
+        new_element: DoublyListElement = item.next
+        new_element.prev = item
+        if new_element.next is not None:
+            new_element.next.prev = new_element
+
+    def remove_first(self) -> None:
+        """
+        Removes the first element from the linked list.
+        @return: None
+        """
+        super().remove_first()
+        if self.head is not None:
+            self.head.prev = None
+
+    def remove_after(self, item: DoublyListElement) -> None:
+        """
+        Removes a value from the list after the given element.
+        @param item: element after which to remove the value
+        @return: None
+        """
+        super().remove_after(item)
+        if item is not None and item.next is not None:
+            item.next.prev = item
+
+    def remove_last(self) -> None:
+        """
+        Removes the last element of the list in O(1).
+        @return: None
+        """
+        if self.is_empty():
             return
 
-        self._parent = weakref.ref(new_parent)
+        if self.head == self.tail:
+            self.remove_first()
+            return
 
-    @property
-    def tree(self):
-        # getter
-        if self._tree is None:
+        self.remove_after(self.tail.prev)
+
+    def _element_inserted(self, element: DoublyListElement, previous: DoublyListElement | None,
+                          index_after_equal: bool | None = None) -> None:
+        """
+        Marks the element as owned by the list and updates the aggregates, see LinkedList._element_inserted.
+        @param element: new element of the list
+        @param previous: element before the new one or None if it is the head
+        @param index_after_equal: position of the element among equal values for the index
+        @return: None
+        """
+        element.owner = self
+        super()._element_inserted(element, previous, index_after_equal)
+
+    def _element_removed(self, element: DoublyListElement) -> None:
+        """
+        Releases the ownership of the element and updates the aggregates, see LinkedList._element_removed.
+        @param element: removed element
+        @return: None
+        """
+        element.owner = None
+        super()._element_removed(element)
+
+    def remove_element(self, item: DoublyListElement) -> None:
+        """
+        Removes the given element from the list in O(1).
+        Raises ValueError if the element is not linked in this list, e.g. it was already removed.
+        @param item: element of this list to be removed
+        @return: None
+        """
+        if item.owner is not self:
+            # element of another list or already removed
+            raise ValueError
+
+        if item is self.head:
+            self.remove_first()
+        else:
+            self.remove_after(item.prev)
+
+        # the removed element no longer points into the list
+        item.prev = None
+        item.next = None
+
+    def sort(self, key=None, reverse: bool = False) -> None:
+        """
+        Sorts the list using bottom-up merge sort in O(n log n) and restores the backward links.
+        @param key: function computing the comparison key from a value, values are compared if None
+        @param reverse: sort in descending order if True
+        @return: None
+        """
+        super().sort(key=key, reverse=reverse)
+
+        previous: DoublyListElement | None = None
+        for item in self:
+            item.prev = previous
+            previous = item
+
+    def append(self, value: float) -> DoublyListElement:
+        """
+        Adds a value to the end of the list.
+        @param value: new value to be added to the list
+        @return: the new element
+        """
+        self.add_last(value)
+        return self.tail
+
+    def appendleft(self, value: float) -> DoublyListElement:
+        """
+        Adds a value to the beginning of the list.
+        @param value: new value to be added to the list
+        @return: the new element
+        """
+        self.add_first(value)
+        return self.head
+
+    def pop(self) -> float:
+        """
+        Removes the last element and returns its value.
+        @return: value of the removed element
+        """
+        if self.is_empty():
+            raise IndexError("pop from an empty list")
+
+        value: float = self.tail.value
+        self.remove_last()
+        return value
+
+    def popleft(self) -> float:
+        """
+        Removes the first element and returns its value.
+        @return: value of the removed element
+        """
+        if self.is_empty():
+            raise IndexError("pop from an empty list")
+
+        value: float = self.head.value
+        self.remove_first()
+        return value
+
+
+def _split_run(head: ListElement | None, length: int) -> ListElement | None:
+    """
+    Cuts the chain of elements after the given number of elements.
+    @param head: first element of the run
+    @param length: number of elements to keep in the run
+    @return: first element after the run or None
+    """
+    if head is None:
+        return None
+
+    for _ in range(length - 1):
+        if head.next is None:
             return None
-        # from weak reference to full
-        tree = self._tree()
-        if tree is not None:
-            return tree
-        raise LookupError("Deleted tree reference")
-
-    @tree.setter
-    def tree(self, new_tree) -> None:
-        # setter
-        if new_tree is None:
-            self._tree = None
-            return
+        head = head.next
+
+    rest: ListElement | None = head.next
+    head.next = None
+    return rest
+
+
+def _merge_runs(left: ListElement, right: ListElement | None, key, reverse: bool
+                ) -> tuple[ListElement, ListElement]:
+    """
+    Merges two sorted chains of elements into one by relinking them, equal values keep their order.
+    @param left: first element of the left run
+    @param right: first element of the right run or None
+    @param key: function computing the comparison key from a value or None
+    @param reverse: runs are sorted in descending order if True
+    @return: first and last element of the merged run
+    """
+    head: ListElement | None = None
+    tail: ListElement | None = None
+
+    while left is not None and right is not None:
+        left_key = left.value if key is None else key(left.value)
+        right_key = right.value if key is None else key(right.value)
+
+        # right element goes first only if it is strictly before the left one, this keeps the sort stable
+        if (left_key < right_key) if reverse else (right_key < left_key):
+            chosen: ListElement = right
+            right = right.next
+        else:
+            chosen: ListElement = left
+            left = left.next
+
+        if tail is None:
+            head = chosen
+        else:
+            tail.next = chosen
+        tail = chosen
+
+    rest: ListElement | None = left if left is not None else right
+    if tail is None:
+        head = rest
+    else:
+        tail.next = rest
+
+    # find the new tail in the rest of the run
+    tail = tail if rest is None else rest
+    while tail.next is not None:
+        tail = tail.next
+    return head, tail
+
+
+class BinaryNode:
+    """
+    Class representing a node in a binary tree.
+    """
+    # nodes keep no parent or tree references, the tree remembers the path while descending
+    __slots__ = ("left", "right", "value", "size", "total")
 
-        self._tree = weakref.ref(new_tree)
+    def __init__(self, value: float = float("nan"), left=None, right=None):
+        self.left = left
+        self.right = right
+        self.value: float = value
+        # number of nodes in the subtree starting with this node
+        self.size: int = 1 + _node_size(left) + _node_size(right)
+        # sum of the values in the subtree, set and kept up to date only by trees with track_sums
+        self.total: float | None = None
 
     def is_leaf(self) -> bool:
         """
@@ -401,58 +1080,28 @@ class BinaryNode:
         """
         return self.left is None and self.right is None
 
-    def is_root(self) -> bool:
+    def update_size(self) -> None:
         """
-        Returns true if the node is a root in the tree.
-        @return: True if the node is a root, False otherwise
+        Recalculates the size of the subtree from the sizes of the children.
+        @return: None
         """
-        if self.tree is None:
-            return False
-        return self.tree.root is self
+        # called for every node on the path of each change, the children are checked inline
+        left, right = self.left, self.right
+        self.size = 1 + (0 if left is None else left.size) + (0 if right is None else right.size)
 
-    def add_value(self, value: float) -> None:
+    def update_total(self) -> None:
         """
-        Adds a value to the subtree starting with this node.
-        @param value: number to add to the subtree
+        Recalculates the sum of the subtree from the sums of the children.
         @return: None
         """
-        if self.value == value:
-            # this value is already in the node/tree, do not add again
-            return
-
-        if value < self.value:
-            # adding to the left
-            if self.left is None:
-                # left is empty, create new node
-                self.left = BinaryNode(value=value, parent=self, tree=self.tree)
-            else:
-                # add to the subtree
-                self.left.add_value(value=value)
-        else:
-            # adding to the right
-            if self.right is None:
-                # right is empty, create new node
-                self.right = BinaryNode(value=value, parent=self, tree=self.tree)
-            else:
-                # add to the subtree
-                self.right.add_value(value=value)
+        self.total = self.value + _node_total(self.left) + _node_total(self.right)
 
     def to_list(self) -> list[float]:
         """
         Converts the subtree to a list of numbers.
         @return: List of sorted numbers from the tree
         """
-        left_list = []
-        if self.left is not None:
-            left_list = self.left.to_list()
-
-        center_list = [self.value]
-
-        right_list = []
-        if self.right is not None:
-            right_list = self.right.to_list()
-
-        return left_list + center_list + right_list
+        return [node.value for node in _iter_nodes(self)]
 
     def find_value(self, value: float):
         """
@@ -460,21 +1109,12 @@ class BinaryNode:
         @param value:
         @return: Binary node containing given value or None
         """
-        if self.value == value:
-            return self
-
-        if value < self.value:
-            # search left
-            if self.left is None:
-                return None
-            else:
-                return self.left.find_value(value)
-        else:
-            # search right
-            if self.right is None:
-                return None
-            else:
-                return self.right.find_value(value)
+        node = self
+        while node is not None:
+            if node.value == value:
+                return node
+            node = node.left if value < node.value else node.right
+        return None
 
     def replace_child(self, child: "BinaryNode", new_child=None) -> None:
         """
@@ -489,20 +1129,6 @@ class BinaryNode:
         if self.right is child:
             self.right = new_child
 
-    def replace_at_parent(self, new_child=None) -> None:
-        """
-        Replaces itself at parent with new child.
-        @param new_child:
-        @return:
-        """
-        # special case: self is root
-        if self.is_root():
-            self.tree.root = new_child
-
-        if self.parent is None:
-            return
-        self.parent.replace_child(self, new_child)
-
     def num_children(self) -> int:
         """
         Returns the number of valid children.
@@ -535,12 +1161,168 @@ class BinaryNode:
         return self
 
 
+def _iter_nodes(node: BinaryNode | None, reverse: bool = False, stack: list[BinaryNode] | None = None):
+    """
+    Generates nodes of the subtree in order by an explicit stack, the memory used is O(height).
+    @param node: root of the subtree or None
+    @param reverse: generate from the maximum to the minimum
+    @param stack: nodes waiting for the visit, used to start in the middle of the tree
+    @return: generator of nodes
+    """
+    if stack is None:
+        stack = []
+
+    if reverse:
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.right
+            node = stack.pop()
+            yield node
+            node = node.left
+        return
+
+    while stack or node is not None:
+        # go as far left as possible, then visit the node and continue to the right
+        while node is not None:
+            stack.append(node)
+            node = node.left
+        node = stack.pop()
+        yield node
+        node = node.right
+
+
+def _union_sorted(first, second):
+    """
+    Generates values of two ascending streams of unique values without duplicates.
+    @param first: ascending iterable
+    @param second: ascending iterable
+    @return: generator of ascending unique values
+    """
+    last = None
+    has_last: bool = False
+    for value in heapq.merge(first, second):
+        if has_last and value == last:
+            continue
+        yield value
+        last = value
+        has_last = True
+
+
+def _intersection_sorted(first, second):
+    """
+    Generates values present in both ascending streams of unique values.
+    @param first: ascending iterable
+    @param second: ascending iterable
+    @return: generator of ascending values
+    """
+    first = iter(first)
+    second = iter(second)
+    value_first = next(first, None)
+    value_second = next(second, None)
+    while value_first is not None and value_second is not None:
+        if value_first < value_second:
+            value_first = next(first, None)
+        elif value_second < value_first:
+            value_second = next(second, None)
+        else:
+            yield value_first
+            value_first = next(first, None)
+            value_second = next(second, None)
+
+
 class BinaryTree:
     """
     Binary tree containing numbers.
     """
-    def __init__(self):
+    # class of the nodes created by the tree
+    node_class = BinaryNode
+
+    def __init__(self, track_sums: bool = False):
+        """
+        @param track_sums: keep sums of the subtrees in the nodes, needed for fast sum_range
+        """
         self.root: BinaryNode | None = None
+        self.track_sums: bool = track_sums
+
+    @classmethod
+    def from_sorted(cls, values, track_sums: bool = False) -> "BinaryTree":
+        """
+        Builds a perfectly balanced tree from strictly ascending values in O(n).
+        @param values: iterable of strictly ascending values
+        @param track_sums: keep sums of the subtrees in the nodes, needed for fast sum_range
+        @return: new tree
+        """
+        values = list(values)
+        for idx in range(1, len(values)):
+            if not values[idx - 1] < values[idx]:
+                raise ValueError
+
+        tree = cls(track_sums=track_sums)
+        tree._build(values)
+        return tree
+
+    @classmethod
+    def from_iterable(cls, values, track_sums: bool = False) -> "BinaryTree":
+        """
+        Builds a perfectly balanced tree from any values, they are sorted and duplicates are dropped first.
+        @param values: iterable of values
+        @param track_sums: keep sums of the subtrees in the nodes, needed for fast sum_range
+        @return: new tree
+        """
+        return cls.from_sorted(sorted(set(values)), track_sums=track_sums)
+
+    def _build(self, values: list[float]) -> None:
+        """
+        Replaces the content of the tree by a perfectly balanced tree of the ascending values.
+        @param values: strictly ascending values
+        @return: None
+        """
+        self.root = self._build_subtree(values, 0, len(values))
+
+    def _build_subtree(self, values: list[float], idx_start: int, idx_end: int) -> BinaryNode | None:
+        """
+        Builds a balanced subtree from the part of the values, the middle value becomes the root.
+        The recursion depth is log2(n).
+        @param values: strictly ascending values
+        @param idx_start: the first index of the part
+        @param idx_end: index after the last value of the part
+        @return: root of the subtree or None for empty part
+        """
+        if idx_start >= idx_end:
+            return None
+
+        idx_middle: int = (idx_start + idx_end) // 2
+        node = self.node_class(value=values[idx_middle])
+        node.left = self._build_subtree(values, idx_start, idx_middle)
+        node.right = self._build_subtree(values, idx_middle + 1, idx_end)
+        self._update_node(node)
+        return node
+
+    def merge(self, other: "BinaryTree") -> None:
+        """
+        Adds all values of the other tree. Both trees are merged as sorted streams in O(n + m)
+        and the tree is rebuilt balanced instead of adding the values one by one.
+        @param other: tree to take the values from, it is not changed
+        @return: None
+        """
+        self._build(list(_union_sorted(self, other)))
+
+    def union(self, other: "BinaryTree") -> "BinaryTree":
+        """
+        Returns new balanced tree with values from any of the trees, built in O(n + m).
+        @param other:
+        @return: new tree of the same class
+        """
+        return type(self).from_sorted(_union_sorted(self, other), track_sums=self.track_sums)
+
+    def intersection(self, other: "BinaryTree") -> "BinaryTree":
+        """
+        Returns new balanced tree with values present in both trees, built in O(n + m).
+        @param other:
+        @return: new tree of the same class
+        """
+        return type(self).from_sorted(_intersection_sorted(self, other), track_sums=self.track_sums)
 
     def is_empty(self) -> bool:
         """
@@ -549,6 +1331,9 @@ class BinaryTree:
         """
         return self.root is None
 
+    def __len__(self) -> int:
+        return _node_size(self.root)
+
     def add_value(self, value: float) -> None:
         """
         Adds given value into the tree.
@@ -556,20 +1341,81 @@ class BinaryTree:
         @return:
         """
         if self.is_empty():
-            self.root = BinaryNode(value=value, tree=self)
+            self.root = self._new_node(value)
             return
 
-        self.root.add_value(value=value)
+        # descend to the leaf, remember the path for retracing
+        path: list[BinaryNode] = []
+        node = self.root
+        while node is not None:
+            if node.value == value:
+                # this value is already in the tree, do not add again
+                return
+            path.append(node)
+            node = node.left if value < node.value else node.right
+
+        parent = path[-1]
+        new_node = self._new_node(value)
+        if value < parent.value:
+            parent.left = new_node
+        else:
+            parent.right = new_node
+
+        self._retrace(path, 1)
+
+    def _new_node(self, value: float) -> BinaryNode:
+        """
+        Creates a leaf node, its sum is set only if the tree tracks sums.
+        @param value:
+        @return: new node
+        """
+        node = self.node_class(value=value)
+        if self.track_sums:
+            node.total = value
+        return node
+
+    def __iter__(self):
+        """
+        Generates values of the tree in ascending order, the memory used is O(height).
+        @return: generator of values
+        """
+        for node in _iter_nodes(self.root):
+            yield node.value
+
+    def __reversed__(self):
+        """
+        Generates values of the tree in descending order, the memory used is O(height).
+        @return: generator of values
+        """
+        for node in _iter_nodes(self.root, reverse=True):
+            yield node.value
+
+    def iter_from(self, value: float, reverse: bool = False):
+        """
+        Generates values of the tree starting from the given value, which does not need to be in the tree.
+        @param value: the first value to generate if it is in the tree
+        @param reverse: generate values lower or equal to value in descending order instead
+        @return: generator of values
+        """
+        # ancestors with values not before the value are exactly the values to continue with
+        stack: list[BinaryNode] = []
+        node = self.root
+        while node is not None:
+            if (node.value <= value) if reverse else (node.value >= value):
+                stack.append(node)
+                node = node.right if reverse else node.left
+            else:
+                node = node.left if reverse else node.right
+
+        for node in _iter_nodes(None, reverse=reverse, stack=stack):
+            yield node.value
 
     def to_list(self) -> list[float]:
         """
         Converts the tree to a list of floats.
         @return:
         """
-        if self.is_empty():
-            return []
-
-        return self.root.to_list()
+        return list(self)
 
     def print(self) -> None:
         """
@@ -591,19 +1437,47 @@ class BinaryTree:
 
     def remove_value(self, value: float) -> None:
         """
-        Removes the value from the tree.
+        Removes the value from the tree by a single iterative descent.
         @param value:
         @return: None
         """
-        if self.is_empty():
-            return None
+        path: list[BinaryNode] = []
+        node = self.root
+        while node is not None and node.value != value:
+            path.append(node)
+            node = node.left if value < node.value else node.right
 
-        node = self.find_value(value=value)
         if node is None:
             # value is not in the tree
             return
 
-        self.remove_node(node=node)
+        if node.left is not None and node.right is not None:
+            # case: node has both children, replace its value by the maximum of the left subtree
+            path.append(node)
+            to_replace = node.left
+            while to_replace.right is not None:
+                path.append(to_replace)
+                to_replace = to_replace.right
+            node.value = to_replace.value
+            node = to_replace
+
+        # node has at most one child now, the last node on the path is its parent
+        self._replace_child(path[-1] if path else None, node, node.get_single_child())
+
+        self._retrace(path, -1)
+
+    def _replace_child(self, parent: BinaryNode | None, child: BinaryNode, new_child: BinaryNode | None) -> None:
+        """
+        Replaces the child of the parent node, or the root if there is no parent, by the new child.
+        @param parent: parent of the child or None if the child is the root
+        @param child: node to be replaced
+        @param new_child: node or None to put to the place of the child
+        @return: None
+        """
+        if parent is None:
+            self.root = new_child
+        else:
+            parent.replace_child(child, new_child)
 
     def remove_node(self, node: BinaryNode | None = None) -> None:
         """
@@ -614,17 +1488,340 @@ class BinaryTree:
         if node is None:
             return
 
-        if node.is_leaf():
-            node.replace_at_parent(new_child=None)
-            return
+        self.remove_value(node.value)
 
-        if node.num_children() == 1:
-            child = node.get_single_child()
-            child.parent = node.parent
-            node.replace_at_parent(new_child=child)
-            return
+    def _retrace(self, path: list[BinaryNode], size_change: int) -> None:
+        """
+        Updates the nodes along the path from the bottom up after a node was added or removed below them.
+        Subclasses override it to keep the tree balanced.
+        @param path: nodes from the root to the place of the change
+        @param size_change: 1 after adding a node, -1 after removing one
+        @return: None
+        """
+        # runs for every node on the path of each change, the data is updated inline
+        if self.track_sums:
+            for node in reversed(path):
+                node.size += size_change
+                node.update_total()
+        else:
+            for node in path:
+                node.size += size_change
+
+    def _update_node(self, node: BinaryNode) -> None:
+        """
+        Recalculates the data of the node kept about its subtree after the children changed.
+        @param node:
+        @return: None
+        """
+        node.update_size()
+        if self.track_sums:
+            node.update_total()
+
+    def kth(self, k: int) -> float:
+        """
+        Returns the k-th smallest value, counted from 0 like list indices. Runs in O(height).
+        @param k: index of the value in the sorted order
+        @return: k-th smallest value
+        """
+        if not 0 <= k < len(self):
+            raise IndexError
+
+        node = self.root
+        while True:
+            left_size: int = _node_size(node.left)
+            if k < left_size:
+                node = node.left
+            elif k == left_size:
+                return node.value
+            else:
+                k -= left_size + 1
+                node = node.right
+
+    def rank(self, value: float, inclusive: bool = False) -> int:
+        """
+        Returns the number of values smaller than the given value, i.e. its index in the sorted order.
+        The value does not need to be in the tree. Runs in O(height).
+        @param value:
+        @param inclusive: count also the value equal to the given one
+        @return: number of smaller values
+        """
+        count: int = 0
+        node = self.root
+        while node is not None:
+            if node.value < value or (inclusive and node.value == value):
+                count += _node_size(node.left) + 1
+                node = node.right
+            else:
+                node = node.left
+        return count
+
+    def count_range(self, lo: float, hi: float) -> int:
+        """
+        Returns the number of values v with lo <= v <= hi. Runs in O(height).
+        @param lo: lower bound of the range
+        @param hi: upper bound of the range
+        @return: number of values in the range
+        """
+        if hi < lo:
+            return 0
+        return self.rank(hi, inclusive=True) - self.rank(lo)
+
+    def percentile(self, p: float) -> float:
+        """
+        Returns the p-th percentile of the values with linear interpolation between the closest ranks
+        (same as the default method of numpy.percentile). Runs in O(height).
+        @param p: percentile between 0 and 100, e.g. 50 for median
+        @return: value of the percentile
+        """
+        if self.is_empty() or not 0.0 <= p <= 100.0:
+            raise ValueError
+
+        position: float = p / 100.0 * (len(self) - 1)
+        idx_lower: int = math.floor(position)
+        value_lower: float = self.kth(idx_lower)
+        if idx_lower == position:
+            return value_lower
+        value_upper: float = self.kth(idx_lower + 1)
+        return value_lower + (value_upper - value_lower) * (position - idx_lower)
+
+    def range(self, lo: float, hi: float):
+        """
+        Generates values v with lo <= v <= hi in ascending order.
+        Only the subtrees overlapping the range are visited, O(height + number of generated values).
+        @param lo: lower bound of the range
+        @param hi: upper bound of the range
+        @return: generator of values
+        """
+        for value in self.iter_from(lo):
+            if value > hi:
+                return
+            yield value
+
+    def _range_split(self, lo: float, hi: float) -> BinaryNode | None:
+        """
+        Returns the highest node with value in the range, all values of the range are in its subtree.
+        @param lo: lower bound of the range
+        @param hi: upper bound of the range
+        @return: node or None if the range is empty
+        """
+        node = self.root
+        while node is not None and not lo <= node.value <= hi:
+            node = node.right if node.value < lo else node.left
+        return node
+
+    def sum_range(self, lo: float, hi: float) -> float:
+        """
+        Returns the sum of values v with lo <= v <= hi. Runs in O(height) in trees with track_sums,
+        otherwise the values of the range are summed one by one.
+        @param lo: lower bound of the range
+        @param hi: upper bound of the range
+        @return: sum of the values in the range
+        """
+        if not self.track_sums:
+            return math.fsum(self.range(lo, hi))
+
+        split = self._range_split(lo, hi)
+        if split is None:
+            return 0.0
+
+        # only sums of the whole subtrees between the paths to lo and hi are added
+        total: float = split.value
+        node = split.left
+        while node is not None:
+            if node.value >= lo:
+                total += node.value + _node_total(node.right)
+                node = node.left
+            else:
+                node = node.right
+
+        node = split.right
+        while node is not None:
+            if node.value <= hi:
+                total += node.value + _node_total(node.left)
+                node = node.right
+            else:
+                node = node.left
+        return total
+
+    def min_range(self, lo: float, hi: float) -> float:
+        """
+        Returns the minimum of values v with lo <= v <= hi by a single descent.
+        @param lo: lower bound of the range
+        @param hi: upper bound of the range
+        @return: minimal value in the range, NaN if the range is empty
+        """
+        split = self._range_split(lo, hi)
+        if split is None:
+            return float("nan")
+
+        # the smallest value not below lo in the left subtree of the split node
+        best: float = split.value
+        node = split.left
+        while node is not None:
+            if node.value >= lo:
+                best = node.value
+                node = node.left
+            else:
+                node = node.right
+        return best
+
+    def max_range(self, lo: float, hi: float) -> float:
+        """
+        Returns the maximum of values v with lo <= v <= hi by a single descent.
+        @param lo: lower bound of the range
+        @param hi: upper bound of the range
+        @return: maximal value in the range, NaN if the range is empty
+        """
+        split = self._range_split(lo, hi)
+        if split is None:
+            return float("nan")
+
+        # the largest value not above hi in the right subtree of the split node
+        best: float = split.value
+        node = split.right
+        while node is not None:
+            if node.value <= hi:
+                best = node.value
+                node = node.right
+            else:
+                node = node.left
+        return best
+
+
+def _node_size(node: BinaryNode | None) -> int:
+    """
+    Returns the number of nodes in the subtree starting with the node.
+    @param node: node of the binary tree or None
+    @return: size of the subtree, 0 for empty subtree
+    """
+    if node is None:
+        return 0
+    return node.size
+
+
+def _node_total(node: BinaryNode | None) -> float:
+    """
+    Returns the sum of the values in the subtree starting with the node.
+    @param node: node of the binary tree or None
+    @return: sum of the subtree, 0 for empty subtree
+    """
+    if node is None:
+        return 0.0
+    return node.total
+
+
+class AVLNode(BinaryNode):
+    """
+    Class representing a node in a self-balancing (AVL) binary tree.
+    """
+    __slots__ = ("height",)
+
+    def __init__(self, value: float = float("nan"), left=None, right=None):
+        super().__init__(value=value, left=left, right=right)
+        # height of the subtree starting with this node, leaf has height 1
+        self.height: int = 1
+
+    def update_height(self) -> None:
+        """
+        Recalculates the height of the node from the heights of its children.
+        @return: None
+        """
+        left_height: int = 0 if self.left is None else self.left.height
+        right_height: int = 0 if self.right is None else self.right.height
+        self.height = 1 + (left_height if left_height > right_height else right_height)
+
+    def balance_factor(self) -> int:
+        """
+        Returns the difference between the heights of the left and the right subtree.
+        @return: positive number if the left subtree is higher, negative if the right one is higher
+        """
+        return _node_height(self.left) - _node_height(self.right)
+
+
+def _node_height(node: AVLNode | None) -> int:
+    """
+    Returns the height of the subtree starting with the node.
+    @param node: node of the AVL tree or None
+    @return: height of the subtree, 0 for empty subtree
+    """
+    if node is None:
+        return 0
+    return node.height
+
+
+class AVLTree(BinaryTree):
+    """
+    Self-balancing (AVL) binary tree containing numbers.
+    All operations are iterative and the height of the tree is always O(log n).
+    """
+    node_class = AVLNode
+
+    def _retrace(self, path: list[AVLNode], size_change: int) -> None:
+        """
+        Updates the nodes along the path from the bottom up and rotates unbalanced nodes.
+        Rotations change the subtrees, so the sizes are recalculated instead of shifted by size_change.
+        @param path: nodes from the root to the place of the last change
+        @param size_change: 1 after adding a node, -1 after removing one
+        @return: None
+        """
+        for idx in reversed(range(len(path))):
+            node = path[idx]
+            height_before: int = node.height
+            self._update_node(node)
+            balance: int = node.balance_factor()
+
+            if balance > 1:
+                if node.left.balance_factor() < 0:
+                    # left-right case
+                    node.left = self._rotate_left(node.left)
+                self._replace_child(path[idx - 1] if idx > 0 else None, node, self._rotate_right(node))
+            elif balance < -1:
+                if node.right.balance_factor() > 0:
+                    # right-left case
+                    node.right = self._rotate_right(node.right)
+                self._replace_child(path[idx - 1] if idx > 0 else None, node, self._rotate_left(node))
+            elif node.height == height_before:
+                # heights above do not change any more, only sizes and sums of the ancestors do
+                update_subtree = super()._update_node
+                for idx_ancestor in reversed(range(idx)):
+                    update_subtree(path[idx_ancestor])
+                return
+
+    def _update_node(self, node: AVLNode) -> None:
+        """
+        Recalculates the height and the data of the node kept about its subtree after the children changed.
+        @param node:
+        @return: None
+        """
+        node.update_height()
+        super()._update_node(node)
+
+    def _rotate_left(self, node: AVLNode) -> AVLNode:
+        """
+        Rotates the subtree to the left, the right child becomes the new subtree root.
+        The caller links the new root to the parent.
+        @param node: root of the rotated subtree
+        @return: new root of the subtree
+        """
+        pivot = node.right
+        node.right = pivot.left
+        pivot.left = node
+
+        self._update_node(node)
+        self._update_node(pivot)
+        return pivot
+
+    def _rotate_right(self, node: AVLNode) -> AVLNode:
+        """
+        Rotates the subtree to the right, the left child becomes the new subtree root.
+        The caller links the new root to the parent.
+        @param node: root of the rotated subtree
+        @return: new root of the subtree
+        """
+        pivot = node.left
+        node.left = pivot.right
+        pivot.right = node
 
-        # case: node has both children
-        to_replace = node.left.get_most_right()
-        node.value = to_replace.value
-        self.remove_node(node=to_replace)
+        self._update_node(node)
+        self._update_node(pivot)
+        return pivot
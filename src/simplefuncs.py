@@ -1,4 +1,39 @@
+import collections
+import functools
+import heapq
 import math
+import mmap
+import struct
+import sys
+from array import array
+
+from .backend import as_ndarray, np
+
+
+def _stable_quadratic_roots(a: float, b: float, c: float) -> tuple[float, float]:
+    """
+    Real roots of quadratic equation without catastrophic cancellation when b**2 >> 4*a*c.
+    The larger root by magnitude is q/a with q = -(b + sign(b)*sqrt(d))/2, the other one is c/q.
+    @param a: quadratic term
+    @param b: linear term
+    @param c: constant term
+    @return: roots of quadratic equation ordered as (-b + sqrt(d))/2a, (-b - sqrt(d))/2a, NaN if not real
+    """
+    # degenerate and complex roots case
+    if a == 0.0:
+        return float('nan'), float('nan')
+    d: float = b * b - 4.0 * a * c
+    if d < 0.0 or d != d:
+        return float('nan'), float('nan')
+    # single root case
+    if d == 0.0:
+        x1: float = -0.5 * b / a
+        return x1, x1
+    q: float = -0.5 * (b + math.copysign(math.sqrt(d), b))
+    # q == 0 only for b == c == 0, handled by the single root case
+    if math.copysign(1.0, b) < 0.0:
+        return q / a, c / q
+    return c / q, q / a
 
 
 def real_quadratic_roots(a: float, b: float, c: float) -> tuple[float, float]:
@@ -12,20 +47,64 @@ def real_quadratic_roots(a: float, b: float, c: float) -> tuple[float, float]:
     # check if is quadratic
     if a == 0.0:
         raise ValueError
-    # discriminant
-    d: float = b ** 2.0 - 4.0 * a * c
-    # single root case
-    if d == 0.0:
-        x1: float = -0.5 * b / a
-        return x1, x1
-    # complex roots case
-    if d < 0.0:
-        return float('nan'), float('nan')
-    # real roots case
-    sqrt_d: float = math.sqrt(d)
-    x1: float = 0.5 * (-b + sqrt_d) / a
-    x2: float = 0.5 * (-b - sqrt_d) / a
-    return x1, x2
+    return _stable_quadratic_roots(a, b, c)
+
+
+def real_quadratic_roots_many(a, b, c) -> tuple:
+    """
+    Calculates real roots of many quadratic equations: a[i]*x**2 + b[i]*x + c[i] = 0.
+    Roots of equations with complex roots or a[i] == 0 are NaN, use x != x (or numpy.isnan) as the mask.
+    NumPy arrays are processed by vectorized NumPy operations if NumPy is installed.
+    @param a: quadratic terms
+    @param b: linear terms
+    @param c: constant terms
+    @return: arrays of the first and the second roots, numpy arrays for numpy input, array('d') otherwise
+    """
+    if not len(a) == len(b) == len(c):
+        raise ValueError
+
+    array_a, array_b, array_c = as_ndarray(a), as_ndarray(b), as_ndarray(c)
+    if array_a is not None and array_b is not None and array_c is not None:
+        return _real_quadratic_roots_vectorized(array_a, array_b, array_c)
+
+    roots_first: array = array("d", bytes(8 * len(a)))
+    roots_second: array = array("d", bytes(8 * len(a)))
+    for idx, (value_a, value_b, value_c) in enumerate(zip(a, b, c)):
+        roots_first[idx], roots_second[idx] = _stable_quadratic_roots(value_a, value_b, value_c)
+    return roots_first, roots_second
+
+
+def _real_quadratic_roots_vectorized(a, b, c) -> tuple:
+    """
+    NumPy implementation of real_quadratic_roots_many, same formula as _stable_quadratic_roots.
+    @param a: quadratic terms
+    @param b: linear terms
+    @param c: constant terms
+    @return: numpy arrays of the first and the second roots
+    """
+    a = a.astype(np.float64, copy=False)
+    b = b.astype(np.float64, copy=False)
+    c = c.astype(np.float64, copy=False)
+    # complex roots give NaN from sqrt, zero a and single roots give inf or NaN and are replaced below
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d = b * b - 4.0 * a * c
+        q = -0.5 * (b + np.copysign(np.sqrt(d), b))
+        root_q = q / a
+        root_c = c / q
+        negative_b = np.signbit(b)
+        roots_first = np.where(negative_b, root_q, root_c)
+        roots_second = np.where(negative_b, root_c, root_q)
+
+        single = d == 0.0
+        if single.any():
+            single_root = -0.5 * b[single] / a[single]
+            roots_first[single] = single_root
+            roots_second[single] = single_root
+
+    degenerate = a == 0.0
+    roots_first[degenerate] = np.nan
+    roots_second[degenerate] = np.nan
+    return roots_first, roots_second
 
 
 def print_tree(num_levels: int) -> None:
@@ -101,12 +180,79 @@ def fib_number_close(num: int) -> int:
     return int(round((phi ** num - psi ** num) / sqrt5))
 
 
+def _fib_pair(num: int) -> tuple[int, int]:
+    """
+    Fast doubling: F(2k) = F(k) * (2*F(k+1) - F(k)), F(2k+1) = F(k)**2 + F(k+1)**2.
+    @param num: non-negative index
+    @return: nth and (n+1)th fibonacci number
+    """
+    f_n: int = 0
+    f_n1: int = 1
+    # walk through the bits of num from the most significant one
+    for bit in bin(num)[2:]:
+        f_2n: int = f_n * (2 * f_n1 - f_n)
+        f_2n1: int = f_n * f_n + f_n1 * f_n1
+        if bit == "1":
+            f_n, f_n1 = f_2n1, f_2n + f_2n1
+        else:
+            f_n, f_n1 = f_2n, f_2n1
+    return f_n, f_n1
+
+
+@functools.lru_cache(maxsize=128)
+def fib(num: int) -> int:
+    """
+    Exact fibonacci numbers by fast doubling, O(log n) big-integer multiplications.
+    Recently computed values are kept in a bounded LRU cache.
+    @param num: corresponds to nth fibonacci number
+    @return: nth fibonacci number
+    """
+    if num < 0:
+        raise ValueError
+
+    return _fib_pair(num)[0]
+
+
+def fib_range(num_start: int, num_end: int):
+    """
+    Generates consecutive fibonacci numbers F(num_start), ..., F(num_end - 1).
+    Only the first two values are computed by fast doubling, the rest by single additions.
+    @param num_start: index of the first generated fibonacci number
+    @param num_end: index after the last generated fibonacci number
+    @return: generator of fibonacci numbers
+    """
+    if num_start < 0:
+        raise ValueError
+
+    f_n, f_n1 = _fib_pair(num_start)
+    for _ in range(num_start, num_end):
+        yield f_n
+        f_n, f_n1 = f_n1, f_n + f_n1
+
+
 def min_of_list(lst: list[float]) -> tuple[float, int]:
     """
     Find minimum value of list together with index of the minimum.
+    NumPy arrays and buffer-protocol objects are processed by NumPy if it is installed.
     @param lst: non-empty list of values
     @return: minimum of list, index of the minimum
     """
+    array_view = as_ndarray(lst)
+    if array_view is not None:
+        if array_view.size == 0:
+            raise ValueError
+        try:
+            # NaN is skipped like in the loop below
+            min_idx: int = int(np.nanargmin(array_view))
+        except ValueError:
+            # only NaN values, none of them is smaller than the initial infinity
+            return float('inf'), -1
+        min_value = array_view[min_idx].item()
+        if min_value == float('inf'):
+            # the loop finds no value smaller than infinity either
+            return min_value, -1
+        return min_value, min_idx
+
     if not lst:
         raise ValueError
 
@@ -120,6 +266,10 @@ def min_of_list(lst: list[float]) -> tuple[float, int]:
     return min_value, min_idx
 
 
+# default CZK denominations
+CZK_COINS: tuple[int, ...] = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1_000, 2_000, 5_000)
+
+
 def coin_change(value: int, coins: list[int] | None = None) -> list[int]:
     """
     Returns a list of coins needed to make a change. Uses greedy algorithm.
@@ -134,10 +284,10 @@ def coin_change(value: int, coins: list[int] | None = None) -> list[int]:
         return []
 
     if not coins:
-        # default CZK denominations
-        coins: list[int] = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1_000, 2_000, 5_000]
+        coins = CZK_COINS
 
-    coins.sort(reverse=True)
+    # sorted copy, the list of the caller stays untouched
+    coins = sorted(coins, reverse=True)
 
     results: list[int] = []
 
@@ -153,6 +303,229 @@ def coin_change(value: int, coins: list[int] | None = None) -> list[int]:
     return results
 
 
+class CoinChanger:
+    """
+    Makes minimal change for a fixed denomination system. The system is validated and analysed once:
+    canonical systems use the greedy algorithm, the others answer from a dynamic programming table.
+    Values above the table ceiling are paid by the largest coin plus the cheapest rest with the same
+    remainder modulo the largest coin, found by the shortest paths over the remainders.
+    """
+
+    def __init__(self, coins: list[int] | None = None, ceiling: int = 10_000):
+        """
+        :param coins: list of coins/banknotes, CZK denominations if None
+        :param ceiling: largest value kept in the dynamic programming table of non-canonical systems
+        """
+        if coins is None:
+            coins = CZK_COINS
+
+        if not coins or any(not isinstance(coin, int) or coin <= 0 for coin in coins) or ceiling < 0:
+            raise ValueError
+
+        # ascending unique denominations
+        self.coins: tuple[int, ...] = tuple(sorted(set(coins)))
+        self.is_canonical: bool = self._check_canonical()
+
+        self.ceiling: int = 0
+        # minimal number of coins for each value (-1 if it cannot be paid) and the index of the last coin used
+        self._table_counts: array = array("l")
+        self._table_coins: array = array("l")
+        # for each remainder modulo the largest coin the sum of the cheapest rest paid by the smaller coins
+        # (-1 if the remainder cannot be paid) and the index of the last coin of the rest
+        self._residue_sums: array = array("l")
+        self._residue_coins: array = array("l")
+        if not self.is_canonical:
+            self.ceiling = ceiling
+            self._table_counts, self._table_coins = self._build_table(self.ceiling)
+            self._residue_sums, self._residue_coins = self._build_residues()
+
+    def _build_table(self, ceiling: int) -> tuple[array, array]:
+        """
+        Dynamic programming table of optimal change for all values up to ceiling.
+        :param ceiling: the largest value in the table
+        :return: minimal coin counts and indices of the last used coins
+        """
+        counts: array = array("l", [-1]) * (ceiling + 1)
+        last_coins: array = array("l", [-1]) * (ceiling + 1)
+        counts[0] = 0
+
+        for value in range(1, ceiling + 1):
+            best_count: int = -1
+            best_coin: int = -1
+            for coin_idx, coin_value in enumerate(self.coins):
+                if coin_value > value:
+                    break
+                rest_count: int = counts[value - coin_value]
+                if rest_count >= 0 and (best_count < 0 or rest_count + 1 < best_count):
+                    best_count = rest_count + 1
+                    best_coin = coin_idx
+            counts[value] = best_count
+            last_coins[value] = best_coin
+        return counts, last_coins
+
+    def _build_residues(self) -> tuple[array, array]:
+        """
+        Shortest paths over the remainders modulo the largest coin, a smaller coin moves a remainder by its value
+        and costs the number of largest coins it does not replace. Change of a value with the rest r paid by
+        k smaller coins uses (value - r) / largest + k coins, so the cheapest rest minimizes largest * k - r.
+        Ties are broken by the smaller rest, so the rest fits below as many values as possible.
+        :return: rest sums and indices of the last coins of the rests for all remainders
+        """
+        largest_coin: int = self.coins[-1]
+        rest_costs: list[int | None] = [None] * largest_coin
+        rest_sums: array = array("l", [-1]) * largest_coin
+        last_coins: array = array("l", [-1]) * largest_coin
+        rest_costs[0] = 0
+        rest_sums[0] = 0
+
+        heap: list[tuple[int, int, int]] = [(0, 0, 0)]
+        while heap:
+            cost, rest_sum, residue = heapq.heappop(heap)
+            if (cost, rest_sum) != (rest_costs[residue], rest_sums[residue]):
+                # outdated heap entry
+                continue
+            for coin_idx, coin_value in enumerate(self.coins[:-1]):
+                new_residue: int = (residue + coin_value) % largest_coin
+                new_cost: int = cost + largest_coin - coin_value
+                new_sum: int = rest_sum + coin_value
+                if rest_costs[new_residue] is None or (new_cost, new_sum) < (rest_costs[new_residue],
+                                                                           rest_sums[new_residue]):
+                    rest_costs[new_residue] = new_cost
+                    rest_sums[new_residue] = new_sum
+                    last_coins[new_residue] = coin_idx
+                    heapq.heappush(heap, (new_cost, new_sum, new_residue))
+        return rest_sums, last_coins
+
+    def _greedy_count(self, value: int) -> int:
+        """
+        Number of coins used by the greedy algorithm.
+        :param value: value to be returned
+        :return: number of coins or -1 if greedy cannot pay the value
+        """
+        coin_count: int = 0
+        for coin_value in reversed(self.coins):
+            coin_count += value // coin_value
+            value %= coin_value
+        return coin_count if value == 0 else -1
+
+    def _check_canonical(self) -> bool:
+        """
+        Checks if the greedy algorithm is optimal for the system. According to Kozen and Zaks, the smallest
+        counterexample (if any) is smaller than the sum of the two largest coins.
+        :return: True if the system is canonical
+        """
+        if self.coins[0] != 1:
+            # greedy may get stuck without the unit coin
+            return False
+        if len(self.coins) < 3:
+            return True
+
+        limit: int = self.coins[-1] + self.coins[-2]
+        counts, _ = self._build_table(limit)
+        return all(self._greedy_count(value) == counts[value] for value in range(1, limit + 1))
+
+    def change(self, value: int) -> dict[int, int]:
+        """
+        Returns the minimal change for the value.
+        :param value: value to be returned
+        :return: number of coins/banknotes for each used denomination, the largest first
+        """
+        if value < 0:
+            raise ValueError
+
+        results: dict[int, int] = {}
+        if self.is_canonical:
+            for coin_value in reversed(self.coins):
+                coin_count: int = value // coin_value
+                if coin_count > 0:
+                    results[coin_value] = coin_count
+                    value -= coin_value * coin_count
+            return results
+
+        counts: dict[int, int] = {}
+        largest_coin: int = self.coins[-1]
+        table_counts: array = self._table_counts
+        table_coins: array = self._table_coins
+        if value > self.ceiling:
+            residue: int = value % largest_coin
+            rest_sum: int = self._residue_sums[residue]
+            if rest_sum < 0:
+                # no combination of the coins has the remainder
+                raise ValueError
+
+            if rest_sum <= value:
+                # the largest coins pay everything but the cheapest rest
+                if value > rest_sum:
+                    counts[largest_coin] = (value - rest_sum) // largest_coin
+                while rest_sum > 0:
+                    coin_value: int = self.coins[self._residue_coins[residue]]
+                    counts[coin_value] = counts.get(coin_value, 0) + 1
+                    rest_sum -= coin_value
+                    residue = (residue - coin_value) % largest_coin
+                value = 0
+            else:
+                # the value is below the cheapest rest, the table is computed on demand and not kept
+                table_counts, table_coins = self._build_table(value)
+
+        if table_counts[value] < 0:
+            # value cannot be paid by the coins
+            raise ValueError
+
+        while value > 0:
+            coin_value: int = self.coins[table_coins[value]]
+            counts[coin_value] = counts.get(coin_value, 0) + 1
+            value -= coin_value
+
+        for coin_value in reversed(self.coins):
+            if coin_value in counts:
+                results[coin_value] = counts[coin_value]
+        return results
+
+    def change_many(self, values: list[int]) -> list[dict[int, int]]:
+        """
+        Returns the minimal change for each of the values.
+        :param values: values to be returned
+        :return: list of change results, see change
+        """
+        return [self.change(value) for value in values]
+
+
+def _lower_bound(value: float, all_values: list[float], index_first: int, index_end: int) -> int:
+    """
+    Iterative binary search of the first position with a value not smaller than the given one.
+    :param value: the value to look for
+    :param all_values: ordered list of values
+    :param index_first: the first index of the searched part
+    :param index_end: index after the last value of the searched part
+    :return: the first index in [index_first, index_end] where the value can be inserted
+    """
+    while index_first < index_end:
+        middle_index: int = (index_first + index_end) // 2
+        if all_values[middle_index] < value:
+            index_first = middle_index + 1
+        else:
+            index_end = middle_index
+    return index_first
+
+
+def _upper_bound(value: float, all_values: list[float], index_first: int, index_end: int) -> int:
+    """
+    Iterative binary search of the first position with a value larger than the given one.
+    :param value: the value to look for
+    :param all_values: ordered list of values
+    :param index_first: the first index of the searched part
+    :param index_end: index after the last value of the searched part
+    :return: the last index in [index_first, index_end] where the value can be inserted
+    """
+    while index_first < index_end:
+        middle_index: int = (index_first + index_end) // 2
+        if all_values[middle_index] <= value:
+            index_first = middle_index + 1
+        else:
+            index_end = middle_index
+    return index_first
+
+
 def find_value_in_ordered_list(value: float,
                                all_values: list[float],
                                index_first: int = 0,
@@ -162,33 +535,108 @@ def find_value_in_ordered_list(value: float,
     Finds the index of the value in an ordered list.
     :param value: the value to look for
     :param all_values: list of values
-    :param index_first:
-    :param index_last:
-    :return: index of the value in all_values or -1 if nothing found
+    :param index_first: the first index of the searched part
+    :param index_last: the last index of the searched part
+    :return: index of the (leftmost) value in all_values or -1 if nothing found
     """
-    if not all_values:
+    array_view = as_ndarray(all_values)
+    if array_view is not None:
+        if index_last is None:
+            index_last = len(array_view) - 1
+        index: int = index_first + int(array_view[index_first:index_last + 1].searchsorted(value))
+        if index <= index_last and array_view[index] == value:
+            return index
         return -1
 
     if index_last is None:
         index_last: int = len(all_values) - 1
 
-    if value < all_values[0]:
-        return -1
-    if value > all_values[-1]:
-        return -1
+    index: int = _lower_bound(value, all_values, index_first, index_last + 1)
+    if index <= index_last and all_values[index] == value:
+        return index
+    return -1
 
-    middle_index: int = (index_first + index_last) // 2
 
-    if all_values[middle_index] == value:
-        return middle_index
+_SEARCH_VARIANTS: tuple[str, ...] = ("leftmost", "rightmost", "insertion")
 
-    if index_first == index_last:
-        return -1
 
-    if value > all_values[middle_index]:
-        return find_value_in_ordered_list(value, all_values, middle_index + 1, index_last)
+def find_values_in_ordered_list(values: list[float],
+                                all_values: list[float],
+                                variant: str = "leftmost"):
+    """
+    Finds the indices of many values in an ordered list at once.
+    Sorted queries are answered by a single merge-walk over all_values in O(m + n)
+    when it is cheaper than m binary searches.
+    :param values: the values to look for
+    :param all_values: ordered list of values
+    :param variant: "leftmost" / "rightmost" returns the index of the first / last occurrence or -1,
+                    "insertion" returns the position where the value would be inserted
+    :return: list of indices, NumPy array if all_values is an array and NumPy is installed
+    """
+    if variant not in _SEARCH_VARIANTS:
+        raise ValueError
+
+    array_view = as_ndarray(all_values)
+    if array_view is not None:
+        return _find_values_vectorized(values, array_view, variant)
+
+    num_all: int = len(all_values)
+    # bound searches first values not smaller (leftmost/insertion) or larger (rightmost) than the query
+    strict: bool = variant == "rightmost"
+
+    queries_sorted: bool = all(values[idx] <= values[idx + 1] for idx in range(len(values) - 1))
+    if queries_sorted and len(values) * num_all.bit_length() > len(values) + num_all:
+        positions: list[int] = []
+        position: int = 0
+        for value in values:
+            # queries are sorted, the position only moves forward
+            while position < num_all and (all_values[position] <= value if strict
+                                          else all_values[position] < value):
+                position += 1
+            positions.append(position)
+    else:
+        bound = _upper_bound if strict else _lower_bound
+        positions: list[int] = [bound(value, all_values, 0, num_all) for value in values]
+
+    if variant == "insertion":
+        return positions
+
+    results: list[int] = []
+    for value, position in zip(values, positions):
+        if strict:
+            # the last occurrence is right before the upper bound
+            position -= 1
+        if 0 <= position < num_all and all_values[position] == value:
+            results.append(position)
+        else:
+            results.append(-1)
+    return results
+
+
+def _find_values_vectorized(values, all_values, variant: str):
+    """
+    NumPy implementation of find_values_in_ordered_list.
+    :param values: the values to look for
+    :param all_values: ordered NumPy array
+    :param variant: "leftmost", "rightmost" or "insertion"
+    :return: NumPy array of indices
+    """
+    queries = as_ndarray(values)
+    if queries is None:
+        queries = np.asarray(values)
+
+    if variant == "insertion":
+        return all_values.searchsorted(queries, side="left")
+
+    if variant == "rightmost":
+        positions = all_values.searchsorted(queries, side="right") - 1
     else:
-        return find_value_in_ordered_list(value, all_values, index_first, middle_index - 1)
+        positions = all_values.searchsorted(queries, side="left")
+
+    valid = (positions >= 0) & (positions < len(all_values))
+    found = np.zeros(len(positions), dtype=bool)
+    found[valid] = all_values[positions[valid]] == queries[valid]
+    return np.where(found, positions, -1)
 
 
 def print_as_matrix(lst: list[list[float]]) -> None:
@@ -212,25 +660,30 @@ def create_matrix(num_rows: int, num_columns: int, default_value: float = 0.0):
     return [[default_value] * num_columns for _ in range(num_rows)]
 
 
-def allowed_knight_movements(idx1: int, idx2: int) -> tuple[list[int], list[int]]:
+# all possible knight movements, first and second coordinate differences
+_KNIGHT_DIFFS_1: tuple[int, ...] = (-1, -2, -2, -1, 1, 2, 2, 1)
+_KNIGHT_DIFFS_2: tuple[int, ...] = (2, 1, -1, -2, -2, -1, 1, 2)
+
+
+def allowed_knight_movements(idx1: int, idx2: int,
+                             num_rows: int = 8, num_columns: int = 8) -> tuple[list[int], list[int]]:
     """
     Returns lists of all possible movements of a knight from given coordinates.
     :param idx1: knight first coordinate
     :param idx2: knight second coordinate
+    :param num_rows: number of rows of the board
+    :param num_columns: number of columns of the board
     :return: two lists of allowed movements
     """
-    idx1_diffs: list[int] = [-1, -2, -2, -1, 1, 2, 2, 1]
-    idx2_diffs: list[int] = [2, 1, -1, -2, -2, -1, 1, 2]
-
     idx1_allowed: list[int] = []
     idx2_allowed: list[int] = []
 
-    for idx in range(len(idx1_diffs)):
+    for idx in range(len(_KNIGHT_DIFFS_1)):
         # possible new coordinates of the knight
-        idx1_new: int = idx1 + idx1_diffs[idx]
-        idx2_new: int = idx2 + idx2_diffs[idx]
+        idx1_new: int = idx1 + _KNIGHT_DIFFS_1[idx]
+        idx2_new: int = idx2 + _KNIGHT_DIFFS_2[idx]
 
-        if -1 < idx1_new < 8 and -1 < idx2_new < 8:
+        if -1 < idx1_new < num_rows and -1 < idx2_new < num_columns:
             # new coordinates are inside the board
             idx1_allowed.append(idx1_new)
             idx2_allowed.append(idx2_new)
@@ -238,6 +691,392 @@ def allowed_knight_movements(idx1: int, idx2: int) -> tuple[list[int], list[int]
     return idx1_allowed, idx2_allowed
 
 
+@functools.lru_cache(maxsize=4)
+def knight_adjacency(num_rows: int, num_columns: int):
+    """
+    Precomputes allowed knight movements for all tiles of the board, cached per board size.
+    Tile (idx1, idx2) has flat index idx1 * num_columns + idx2.
+    :param num_rows: number of rows of the board
+    :param num_columns: number of columns of the board
+    :return: flat table with 8 target tiles for each tile, -1 for movements off the board;
+             NumPy array if NumPy is installed, array('l') otherwise
+    """
+    if num_rows < 1 or num_columns < 1:
+        raise ValueError
+
+    num_moves: int = len(_KNIGHT_DIFFS_1)
+    if np is not None:
+        idx1, idx2 = np.divmod(np.arange(num_rows * num_columns), num_columns)
+        table = np.full((num_rows * num_columns, num_moves), -1, dtype=np.int64)
+        for move in range(num_moves):
+            idx1_new = idx1 + _KNIGHT_DIFFS_1[move]
+            idx2_new = idx2 + _KNIGHT_DIFFS_2[move]
+            inside = (idx1_new >= 0) & (idx1_new < num_rows) & (idx2_new >= 0) & (idx2_new < num_columns)
+            table[inside, move] = idx1_new[inside] * num_columns + idx2_new[inside]
+        return table.ravel()
+
+    table = array("l", [-1]) * (num_rows * num_columns * num_moves)
+    position: int = 0
+    for idx1 in range(num_rows):
+        for idx2 in range(num_columns):
+            for move in range(num_moves):
+                idx1_new: int = idx1 + _KNIGHT_DIFFS_1[move]
+                idx2_new: int = idx2 + _KNIGHT_DIFFS_2[move]
+                if -1 < idx1_new < num_rows and -1 < idx2_new < num_columns:
+                    table[position] = idx1_new * num_columns + idx2_new
+                position += 1
+    return table
+
+
+def knight_distances(num_rows: int,
+                     num_columns: int,
+                     starts: list[tuple[int, int]],
+                     obstacles=None) -> array:
+    """
+    Returns the minimal number of knight movements to all board tiles from the nearest start tile (BFS).
+    :param num_rows: number of rows of the board
+    :param num_columns: number of columns of the board
+    :param starts: coordinates of the start tiles
+    :param obstacles: flat mask of blocked tiles (num_rows * num_columns values, truthy means blocked) or None
+    :return: flat array('l') of distances, tile (idx1, idx2) at idx1 * num_columns + idx2, -1 if unreachable
+    """
+    num_tiles: int = num_rows * num_columns
+    if obstacles is not None and len(obstacles) != num_tiles:
+        raise ValueError
+
+    start_tiles: list[int] = []
+    for idx1, idx2 in starts:
+        if idx1 < 0 or idx1 >= num_rows or idx2 < 0 or idx2 >= num_columns:
+            # coordinates are not on the board
+            raise ValueError
+        if obstacles is not None and obstacles[idx1 * num_columns + idx2]:
+            # knight cannot start on a blocked tile
+            raise ValueError
+        start_tiles.append(idx1 * num_columns + idx2)
+
+    adjacency = knight_adjacency(num_rows, num_columns)
+    num_moves: int = len(_KNIGHT_DIFFS_1)
+    distances: array = array("l", [-1]) * num_tiles
+
+    if np is not None:
+        # distances are written through the view, no copy is needed
+        distances_view = np.asarray(memoryview(distances))
+        adjacency_view = adjacency.reshape(num_tiles, num_moves)
+        if obstacles is None:
+            visited = np.zeros(num_tiles, dtype=bool)
+        else:
+            visited = np.array(obstacles, dtype=bool)
+
+        frontier = np.unique(np.array(start_tiles, dtype=np.int64))
+        visited[frontier] = True
+        distances_view[frontier] = 0
+
+        movement_number: int = 0
+        while frontier.size > 0:
+            movement_number += 1
+            targets = adjacency_view[frontier].ravel()
+            targets = targets[targets >= 0]
+            targets = np.unique(targets[~visited[targets]])
+            visited[targets] = True
+            distances_view[targets] = movement_number
+            frontier = targets
+        return distances
+
+    visited_tiles: bytearray = bytearray(num_tiles) if obstacles is None \
+        else bytearray(1 if blocked else 0 for blocked in obstacles)
+    queue: collections.deque[int] = collections.deque()
+    for tile in start_tiles:
+        if not visited_tiles[tile]:
+            visited_tiles[tile] = 1
+            distances[tile] = 0
+            queue.append(tile)
+
+    while queue:
+        tile: int = queue.popleft()
+        movement_number: int = distances[tile] + 1
+        for position in range(tile * num_moves, (tile + 1) * num_moves):
+            target: int = adjacency[position]
+            if target >= 0 and not visited_tiles[target]:
+                visited_tiles[target] = 1
+                distances[target] = movement_number
+                queue.append(target)
+    return distances
+
+
+def _infinite_knight_distance(diff1: int, diff2: int) -> int:
+    """
+    Minimal number of knight movements for the given displacement on an infinite board.
+    :param diff1: first coordinate difference
+    :param diff2: second coordinate difference
+    :return: number of movements
+    """
+    diff_large, diff_small = max(abs(diff1), abs(diff2)), min(abs(diff1), abs(diff2))
+    if diff_large == 1 and diff_small == 0:
+        return 3
+    if diff_large == 2 and diff_small == 2:
+        return 4
+    delta: int = diff_large - diff_small
+    if diff_small > delta:
+        return delta - 2 * ((delta - diff_small) // 3)
+    return delta - 2 * ((delta - diff_small) // 4)
+
+
+class KnightDistanceTable:
+    """
+    Precomputed knight distances between tiles of a board.
+    On boards with both sides at least 5 tiles the distance depends only on the displacement
+    (as on the infinite board), except a corner and its diagonal neighbour, so a table of
+    num_rows * num_columns displacements is enough. Narrow boards are translation invariant along
+    the long side away from its ends: tile pairs are moved into a short reference board keeping
+    their distances from the ends up to _END_ZONE, and long gaps are shortened by the period of 4 columns
+    (2 movements). The reference board stores distances of all its tile pairs.
+    """
+    # boards narrower than this do not follow the infinite board distances
+    MIN_TRANSLATION_SIZE: int = 5
+    # narrow boards: tiles farther than this from an end of the long side are not affected by the end
+    _END_ZONE: int = 8
+    # narrow boards: gaps longer than this grow by 2 movements with every 4 columns
+    _PERIODIC_GAP: int = 8
+    # narrow boards: minimal length of the reference board, keeps both end zones around any shortened gap
+    _REFERENCE_LENGTH: int = 2 * _END_ZONE + _PERIODIC_GAP + 4
+    # file header: magic, number of rows, number of columns, all pairs flag
+    _HEADER = struct.Struct("<4sqqq")
+    _MAGIC: bytes = b"KNDT"
+
+    def __init__(self, num_rows: int = 8, num_columns: int = 8, table=None):
+        """
+        :param num_rows: number of rows of the board
+        :param num_columns: number of columns of the board
+        :param table: already computed table (used when loading from a file), computed if None
+        """
+        if num_rows < 1 or num_columns < 1:
+            raise ValueError
+
+        self.num_rows: int = num_rows
+        self.num_columns: int = num_columns
+        self.all_pairs: bool = min(num_rows, num_columns) < self.MIN_TRANSLATION_SIZE
+        # narrow boards are handled with the long side along the columns
+        self._transposed: bool = num_rows > num_columns
+        self._width: int = min(num_rows, num_columns)
+        self._length: int = max(num_rows, num_columns)
+        self._table_length: int = self._length
+        if self._length > self._REFERENCE_LENGTH + 3:
+            # the reference length has the same remainder modulo the period as the board length
+            self._table_length = self._REFERENCE_LENGTH + (self._length - self._REFERENCE_LENGTH) % 4
+        # distances as 16-bit integers if they fit, -1 for unreachable tiles
+        self.typecode: str = self._typecode(num_rows, num_columns)
+        self.table = table if table is not None else self._build_table()
+
+    @staticmethod
+    def _typecode(num_rows: int, num_columns: int) -> str:
+        """
+        Returns the array typecode of the table, 16-bit integers hold distances of boards up to 2**15 tiles long.
+        :param num_rows: number of rows of the board
+        :param num_columns: number of columns of the board
+        :return: "h" or "i"
+        """
+        # the displacement distance never exceeds (num_rows + num_columns) / 2 + 4
+        return "h" if num_rows + num_columns < 2 ** 15 else "i"
+
+    def _build_table(self) -> array:
+        """
+        Computes the displacement table or, for narrow boards, the table of all tile pairs of the reference board.
+        :return: array of distances
+        """
+        if self.all_pairs:
+            table: array = array(self.typecode)
+            num_tiles: int = self._width * self._table_length
+            for tile in range(num_tiles):
+                table.extend(array(self.typecode, knight_distances(self._width, self._table_length,
+                                                                   [divmod(tile, self._table_length)])))
+            return table
+
+        num_tiles: int = self.num_rows * self.num_columns
+        if np is not None:
+            diff1, diff2 = np.divmod(np.arange(num_tiles), self.num_columns)
+            diff_large, diff_small = np.maximum(diff1, diff2), np.minimum(diff1, diff2)
+            delta = diff_large - diff_small
+            distances = np.where(diff_small > delta,
+                                 delta - 2 * np.floor_divide(delta - diff_small, 3),
+                                 delta - 2 * np.floor_divide(delta - diff_small, 4))
+            distances[(diff_large == 1) & (diff_small == 0)] = 3
+            distances[(diff_large == 2) & (diff_small == 2)] = 4
+            table = array(self.typecode)
+            table.frombytes(distances.astype(np.dtype(self.typecode)).tobytes())
+            return table
+
+        return array(self.typecode, (_infinite_knight_distance(diff1, diff2)
+                                     for diff1 in range(self.num_rows) for diff2 in range(self.num_columns)))
+
+    def _is_corner(self, idx1: int, idx2: int) -> bool:
+        """
+        Checks if the tile is a corner of the board.
+        :param idx1: first coordinate
+        :param idx2: second coordinate
+        :return: True for the four corner tiles
+        """
+        return idx1 in (0, self.num_rows - 1) and idx2 in (0, self.num_columns - 1)
+
+    def _to_reference(self, column_start: int, column_end: int) -> tuple[int, int, int]:
+        """
+        Moves columns of a tile pair of a narrow board into the reference board.
+        :param column_start: column of the first tile along the long side
+        :param column_end: column of the second tile, not lower than column_start
+        :return: columns in the reference board and number of movements removed by shortening the gap
+        """
+        if self._table_length == self._length:
+            return column_start, column_end, 0
+
+        gap: int = column_end - column_start
+        margin_start: int = column_start
+        margin_end: int = self._length - 1 - column_end
+        if margin_start < self._END_ZONE and margin_end < self._END_ZONE:
+            # both ends are close, the gap is shortened by a multiple of the period to fit the reference board
+            gap_new: int = self._table_length - 1 - margin_start - margin_end
+        elif gap <= self._PERIODIC_GAP + 3:
+            gap_new = gap
+        else:
+            gap_new = self._PERIODIC_GAP + (gap - self._PERIODIC_GAP) % 4
+
+        if margin_start < self._END_ZONE:
+            column_start = margin_start
+        elif margin_end < self._END_ZONE:
+            column_start = self._table_length - 1 - margin_end - gap_new
+        else:
+            column_start = self._END_ZONE
+        return column_start, column_start + gap_new, (gap - gap_new) // 2
+
+    def distance(self, start: tuple[int, int], end: tuple[int, int]) -> int:
+        """
+        Returns the minimal number of knight movements between two tiles in O(1).
+        :param start: coordinates of the first tile
+        :param end: coordinates of the second tile
+        :return: number of movements, -1 if the tile cannot be reached
+        """
+        (idx1_start, idx2_start), (idx1_end, idx2_end) = start, end
+        for idx1, idx2 in (start, end):
+            if idx1 < 0 or idx1 >= self.num_rows or idx2 < 0 or idx2 >= self.num_columns:
+                # coordinates are not on the board
+                raise ValueError
+
+        if self.all_pairs:
+            if self._transposed:
+                idx1_start, idx2_start, idx1_end, idx2_end = idx2_start, idx1_start, idx2_end, idx1_end
+            if idx2_start > idx2_end:
+                # distances are symmetric, the start is the tile closer to the beginning of the long side
+                idx1_start, idx2_start, idx1_end, idx2_end = idx1_end, idx2_end, idx1_start, idx2_start
+
+            idx2_start, idx2_end, removed = self._to_reference(idx2_start, idx2_end)
+            num_tiles: int = self._width * self._table_length
+            tile_start: int = idx1_start * self._table_length + idx2_start
+            distance: int = self.table[tile_start * num_tiles + idx1_end * self._table_length + idx2_end]
+            return distance if distance < 0 else distance + removed
+
+        diff1: int = abs(idx1_start - idx1_end)
+        diff2: int = abs(idx2_start - idx2_end)
+        if diff1 == 1 and diff2 == 1 and (self._is_corner(idx1_start, idx2_start) or
+                                          self._is_corner(idx1_end, idx2_end)):
+            # the only shortcut of the infinite board leaving a finite one
+            return 4
+        return self.table[diff1 * self.num_columns + diff2]
+
+    def distances(self, pairs: list[tuple[tuple[int, int], tuple[int, int]]]) -> array:
+        """
+        Returns the minimal numbers of knight movements for many pairs of tiles.
+        :param pairs: list of (start, end) coordinate pairs or NumPy integer array of shape (m, 2, 2)
+        :return: array('l') of numbers of movements, -1 for unreachable tiles
+        """
+        coordinates = as_ndarray(pairs)
+        if coordinates is None or self.all_pairs or len(pairs) == 0:
+            return array("l", (self.distance(tuple(start), tuple(end)) for start, end in pairs))
+
+        coordinates = coordinates.reshape(len(coordinates), 4).astype(np.int64)
+        idx1_start, idx2_start, idx1_end, idx2_end = coordinates.T
+        if ((coordinates[:, 0::2] < 0) | (coordinates[:, 0::2] >= self.num_rows) |
+                (coordinates[:, 1::2] < 0) | (coordinates[:, 1::2] >= self.num_columns)).any():
+            # coordinates are not on the board
+            raise ValueError
+
+        diff1 = np.abs(idx1_start - idx1_end)
+        diff2 = np.abs(idx2_start - idx2_end)
+        table_view = as_ndarray(self.table)
+        results = table_view[diff1 * self.num_columns + diff2].astype(np.int64)
+
+        corner_start = np.isin(idx1_start, (0, self.num_rows - 1)) & np.isin(idx2_start, (0, self.num_columns - 1))
+        corner_end = np.isin(idx1_end, (0, self.num_rows - 1)) & np.isin(idx2_end, (0, self.num_columns - 1))
+        results[(diff1 == 1) & (diff2 == 1) & (corner_start | corner_end)] = 4
+
+        distances: array = array("l")
+        distances.frombytes(results.astype(np.dtype("l")).tobytes())
+        return distances
+
+    def save(self, path: str) -> None:
+        """
+        Stores the table into a binary file which can be memory-mapped by load.
+        :param path: path to the file
+        :return: None
+        """
+        with open(path, "wb") as file:
+            file.write(self._HEADER.pack(self._MAGIC, self.num_rows, self.num_columns, int(self.all_pairs)))
+            file.write(memoryview(self.table).cast("B"))
+
+    @classmethod
+    def load(cls, path: str) -> "KnightDistanceTable":
+        """
+        Memory-maps a table stored by save, the data are shared between processes and not copied.
+        :param path: path to the file
+        :return: distance table
+        """
+        with open(path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, num_rows, num_columns, all_pairs = cls._HEADER.unpack_from(mapped)
+        if magic != cls._MAGIC:
+            raise ValueError
+
+        table = memoryview(mapped)[cls._HEADER.size:].cast(cls._typecode(num_rows, num_columns))
+        knight_table = cls(num_rows, num_columns, table=table)
+        if knight_table.all_pairs != bool(all_pairs):
+            raise ValueError
+        return knight_table
+
+
+@functools.lru_cache(maxsize=8)
+def knight_distance_table(num_rows: int = 8, num_columns: int = 8) -> KnightDistanceTable:
+    """
+    Returns the knight distance table for the board size, tables are kept in a bounded cache.
+    :param num_rows: number of rows of the board
+    :param num_columns: number of columns of the board
+    :return: distance table
+    """
+    return KnightDistanceTable(num_rows, num_columns)
+
+
+def knight_distance(start: tuple[int, int], end: tuple[int, int],
+                    num_rows: int = 8, num_columns: int = 8) -> int:
+    """
+    Returns the minimal number of knight movements between two tiles.
+    :param start: coordinates of the first tile
+    :param end: coordinates of the second tile
+    :param num_rows: number of rows of the board
+    :param num_columns: number of columns of the board
+    :return: number of movements, -1 if the tile cannot be reached
+    """
+    return knight_distance_table(num_rows, num_columns).distance(start, end)
+
+
+def knight_pair_distances(pairs: list[tuple[tuple[int, int], tuple[int, int]]],
+                          num_rows: int = 8, num_columns: int = 8) -> array:
+    """
+    Returns the minimal numbers of knight movements for many pairs of tiles.
+    :param pairs: list of (start, end) coordinate pairs or NumPy integer array of shape (m, 2, 2)
+    :param num_rows: number of rows of the board
+    :param num_columns: number of columns of the board
+    :return: array('l') of numbers of movements, -1 for unreachable tiles
+    """
+    return knight_distance_table(num_rows, num_columns).distances(pairs)
+
+
 def minimal_knight_movements(
         idx1_start: int,
         idx2_start: int,
@@ -246,10 +1085,10 @@ def minimal_knight_movements(
 ) -> list[list[int]]:
     """
     Returns the minimal number of knight movements to all board tile from given coordinates.
-    :param idx1_start:
-    :param idx2_start:
-    :param board:
-    :param movement_number:
+    :param idx1_start: knight first coordinate
+    :param idx2_start: knight second coordinate
+    :param board: board with already known movement numbers to be improved, new 8x8 board if None
+    :param movement_number: number of the first movement from the start tile
     :return: Board containing minimal movements needed to get knight to each tile.
     """
     if idx1_start < 0 or idx1_start > 7 or idx2_start < 0 or idx2_start > 7:
@@ -259,73 +1098,131 @@ def minimal_knight_movements(
     if not board:
         # default board for initialization
         board = create_matrix(8, 8, float("inf"))
-        board[idx1_start][idx2_start] = movement_number - 1
-
-    idx1_allowed, idx2_allowed = allowed_knight_movements(
-        idx1=idx1_start,
-        idx2=idx2_start)
-
-    for idx in range(len(idx1_allowed)):
-        idx1_new = idx1_allowed[idx]
-        idx2_new = idx2_allowed[idx]
-
-        if board[idx1_new][idx2_new] > movement_number:
-            # new minimal number of movements needed to reach this tile
-            board[idx1_new][idx2_new] = movement_number
-            # start additional movements from the new coordinates
-            board = minimal_knight_movements(
-                idx1_start=idx1_new,
-                idx2_start=idx2_new,
-                board=board,
-                movement_number=movement_number + 1)
+
+    distances = knight_distances(8, 8, [(idx1_start, idx2_start)])
+    for idx1 in range(8):
+        for idx2 in range(8):
+            distance: int = distances[idx1 * 8 + idx2]
+            if distance >= 0:
+                board[idx1][idx2] = min(board[idx1][idx2], distance + movement_number - 1)
 
     return board
 
 
-def _single_move(disk_number: int, from_place: str, to_place: str) -> None:
+def _move_text(disk_number: int, from_place: str, to_place: str) -> str:
     """
-    Prints command to move a disk from one place to another.
+    Returns command to move a disk from one place to another.
     :param disk_number:
     :param from_place:
     :param to_place:
-    :return: None
+    :return: text of the command including the line end
     """
-    print("Move disk " + str(disk_number) + " from " + from_place + " to " + to_place + ".")
+    return "Move disk " + str(disk_number) + " from " + from_place + " to " + to_place + ".\n"
 
 
-def hanoi_tower_moves(
+def hanoi_move_count(disk_count: int) -> int:
+    """
+    Returns the number of moves needed to solve hanoi tower problem, 2**n - 1.
+    :param disk_count:
+    :return: number of moves
+    """
+    if disk_count < 1:
+        return 0
+    return (1 << disk_count) - 1
+
+
+def hanoi_move_at(
+        move_number: int,
         disk_count: int,
         from_place: str = "A",
         to_place: str = "C",
-        help_place: str = "B",
-        move_counter: int = 0) -> int:
+        help_place: str = "B") -> tuple[int, str, str]:
     """
-    Prints command to solve hanoi tower problem and returns the number of needed moves.
+    Returns the given move of the hanoi tower solution directly from the binary representation of its number.
+    The disk is given by the lowest set bit, the places cycle in a direction given by the parity of disk_count.
+    :param move_number: number of the move, 1 to 2**disk_count - 1
     :param disk_count:
     :param from_place:
     :param to_place:
     :param help_place:
-    :param move_counter:
-    :return: number of moves executed
+    :return: disk number, place to move the disk from, place to move the disk to
     """
-    if disk_count < 1:
-        return move_counter
+    if move_number < 1 or move_number > hanoi_move_count(disk_count):
+        raise ValueError
+
+    places: tuple[str, str, str] = (from_place, help_place, to_place) if disk_count % 2 == 1 \
+        else (from_place, to_place, help_place)
+    disk_number: int = (move_number & -move_number).bit_length()
+    return (disk_number,
+            places[(move_number & (move_number - 1)) % 3],
+            places[((move_number | (move_number - 1)) + 1) % 3])
+
 
-    move_counter = hanoi_tower_moves(
-        disk_count - 1,
-        from_place=from_place,
-        to_place=help_place,
-        help_place=to_place,
-        move_counter=move_counter)
+def hanoi_moves(
+        disk_count: int,
+        from_place: str = "A",
+        to_place: str = "C",
+        help_place: str = "B"):
+    """
+    Generates moves solving hanoi tower problem lazily, without recursion and printing.
+    :param disk_count:
+    :param from_place:
+    :param to_place:
+    :param help_place:
+    :return: generator of (disk number, from place, to place) tuples
+    """
+    places: tuple[str, str, str] = (from_place, help_place, to_place) if disk_count % 2 == 1 \
+        else (from_place, to_place, help_place)
+    for move_number in range(1, hanoi_move_count(disk_count) + 1):
+        yield ((move_number & -move_number).bit_length(),
+               places[(move_number & (move_number - 1)) % 3],
+               places[((move_number | (move_number - 1)) + 1) % 3])
 
-    _single_move(disk_count, from_place=from_place, to_place=to_place)
-    move_counter += 1
 
-    move_counter = hanoi_tower_moves(
-        disk_count=disk_count - 1,
-        from_place=help_place,
-        to_place=to_place,
-        help_place=from_place,
-        move_counter=move_counter)
+def write_hanoi_moves(
+        disk_count: int,
+        sink,
+        from_place: str = "A",
+        to_place: str = "C",
+        help_place: str = "B",
+        chunk_size: int = 10_000) -> int:
+    """
+    Writes commands solving hanoi tower problem to a file-like sink in buffered chunks.
+    :param disk_count:
+    :param sink: object with write(str) method, e.g. an open text file or sys.stdout
+    :param from_place:
+    :param to_place:
+    :param help_place:
+    :param chunk_size: number of commands written at once
+    :return: number of moves written
+    """
+    chunk: list[str] = []
+    move_counter: int = 0
+    for disk_number, move_from, move_to in hanoi_moves(disk_count, from_place, to_place, help_place):
+        chunk.append(_move_text(disk_number, move_from, move_to))
+        move_counter += 1
+        if len(chunk) >= chunk_size:
+            sink.write("".join(chunk))
+            chunk = []
 
+    if chunk:
+        sink.write("".join(chunk))
     return move_counter
+
+
+def hanoi_tower_moves(
+        disk_count: int,
+        from_place: str = "A",
+        to_place: str = "C",
+        help_place: str = "B",
+        move_counter: int = 0) -> int:
+    """
+    Prints command to solve hanoi tower problem and returns the number of needed moves.
+    :param disk_count:
+    :param from_place:
+    :param to_place:
+    :param help_place:
+    :param move_counter: number of moves executed before
+    :return: number of moves executed
+    """
+    return move_counter + write_hanoi_moves(disk_count, sys.stdout, from_place, to_place, help_place)
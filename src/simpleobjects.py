@@ -1,4 +1,9 @@
+import itertools
 import math
+import operator
+from array import array
+
+from .backend import as_ndarray, np
 
 
 class Vector2d:
@@ -6,10 +11,24 @@ class Vector2d:
     Represents a 2D cartesian vector.
     """
 
+    __slots__ = ("x", "y")
+
+    # coordinates closer than this are equal for ==
+    eq_tolerance: float = 1e-9
+
     def __init__(self, x: float = float("nan"), y: float = float("nan")):
         self.x: float = x
         self.y: float = y
 
+    def _new(self, x: float, y: float) -> "Vector2d":
+        """
+        Creates the result of an operator, subclasses can return their own type.
+        @param x:
+        @param y:
+        @return: new vector
+        """
+        return Vector2d(x=x, y=y)
+
     def to_string(self) -> str:
         """
         Returns a string representation of the vector.
@@ -29,7 +48,7 @@ class Vector2d:
         Returns the norm of the vector.
         @return: value of the norm
         """
-        return math.sqrt(self.x ** 2 + self.y ** 2)
+        return math.hypot(self.x, self.y)
 
     def normalize(self) -> None:
         """
@@ -42,26 +61,32 @@ class Vector2d:
         self.x /= vec_norm
         self.y /= vec_norm
 
-    def multiply(self, value: float):
+    def multiply(self, value: float, out: "Vector2d | None" = None) -> "Vector2d":
         """
         Multiplies the vector by the given value and returns new vector.
         @param value: scalar value to multiply the vector with
-        @return: new vector
+        @param out: vector to write the result to instead of creating new one, can be self
+        @return: new vector or out
         """
         x_new: float = self.x * value
         y_new: float = self.y * value
-        return Vector2d(x=x_new, y=y_new)
+        if out is None:
+            return Vector2d(x=x_new, y=y_new)
+        out.x = x_new
+        out.y = y_new
+        return out
 
-    def divide(self, value: float) -> "Vector2d":
+    def divide(self, value: float, out: "Vector2d | None" = None) -> "Vector2d":
         """
         Divides the vector by the given value and returns new vector.
         @param value: scalar nonzero value
-        @return: new vector
+        @param out: vector to write the result to instead of creating new one, can be self
+        @return: new vector or out
         """
         if value == 0.0:
             raise ZeroDivisionError
 
-        return self.multiply(1.0 / value)
+        return self.multiply(1.0 / value, out)
 
     def copy(self) -> "Vector2d":
         """
@@ -70,23 +95,35 @@ class Vector2d:
         """
         return Vector2d(x=self.x, y=self.y)
 
-    def plus(self, vector: "Vector2d") -> "Vector2d":
+    def plus(self, vector: "Vector2d", out: "Vector2d | None" = None) -> "Vector2d":
         """
         Adds the given vector to the current vector and returns new vector.
         @param vector:
-        @return: new vector
+        @param out: vector to write the result to instead of creating new one, can be self
+        @return: new vector or out
         """
         x_new: float = vector.x + self.x
         y_new: float = vector.y + self.y
-        return Vector2d(x=x_new, y=y_new)
+        if out is None:
+            return Vector2d(x=x_new, y=y_new)
+        out.x = x_new
+        out.y = y_new
+        return out
 
-    def minus(self, vector: "Vector2d") -> "Vector2d":
+    def minus(self, vector: "Vector2d", out: "Vector2d | None" = None) -> "Vector2d":
         """
         Subtracts the given vector to the current vector and returns new vector.
         @param vector:
-        @return: new vector
-        """
-        return self.plus(vector.multiply(-1))
+        @param out: vector to write the result to instead of creating new one, can be self
+        @return: new vector or out
+        """
+        x_new: float = self.x - vector.x
+        y_new: float = self.y - vector.y
+        if out is None:
+            return Vector2d(x=x_new, y=y_new)
+        out.x = x_new
+        out.y = y_new
+        return out
 
     def distance(self, vector: "Vector2d") -> float:
         """
@@ -94,7 +131,7 @@ class Vector2d:
         @param vector: other vector to calculate the distance from
         @return: distance
         """
-        return self.minus(vector).norm()
+        return math.hypot(self.x - vector.x, self.y - vector.y)
 
     def is_equal(self, vector: "Vector2d") -> bool:
         """
@@ -104,12 +141,410 @@ class Vector2d:
         """
         return self.x == vector.x and self.y == vector.y
 
+    def __add__(self, vector: "Vector2d") -> "Vector2d":
+        return self._new(self.x + vector.x, self.y + vector.y)
+
+    def __iadd__(self, vector: "Vector2d") -> "Vector2d":
+        self.x += vector.x
+        self.y += vector.y
+        return self
+
+    def __sub__(self, vector: "Vector2d") -> "Vector2d":
+        return self._new(self.x - vector.x, self.y - vector.y)
+
+    def __isub__(self, vector: "Vector2d") -> "Vector2d":
+        self.x -= vector.x
+        self.y -= vector.y
+        return self
+
+    def __mul__(self, value: float) -> "Vector2d":
+        return self._new(self.x * value, self.y * value)
+
+    __rmul__ = __mul__
+
+    def __imul__(self, value: float) -> "Vector2d":
+        self.x *= value
+        self.y *= value
+        return self
+
+    def __truediv__(self, value: float) -> "Vector2d":
+        if value == 0.0:
+            raise ZeroDivisionError
+        return self._new(self.x / value, self.y / value)
+
+    def __itruediv__(self, value: float) -> "Vector2d":
+        if value == 0.0:
+            raise ZeroDivisionError
+        self.x /= value
+        self.y /= value
+        return self
+
+    def __neg__(self) -> "Vector2d":
+        return self._new(-self.x, -self.y)
+
+    def __abs__(self) -> float:
+        return math.hypot(self.x, self.y)
+
+    def __eq__(self, vector) -> bool:
+        # coordinates are compared with the tolerance of the left operand
+        if not isinstance(vector, Vector2d):
+            return NotImplemented
+        return abs(self.x - vector.x) <= self.eq_tolerance and abs(self.y - vector.y) <= self.eq_tolerance
+
+    # mutable vectors cannot be hashed
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return type(self).__name__ + self.to_string()
+
+
+class FrozenVector2d(Vector2d):
+    """
+    Immutable and hashable 2D cartesian vector, compared exactly so that equal vectors have equal hashes.
+    """
+
+    __slots__ = ()
+
+    eq_tolerance: float = 0.0
+
+    def __init__(self, x: float = float("nan"), y: float = float("nan")):
+        object.__setattr__(self, "x", x)
+        object.__setattr__(self, "y", y)
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError
+
+    def _new(self, x: float, y: float) -> "FrozenVector2d":
+        return FrozenVector2d(x=x, y=y)
+
+    def __hash__(self) -> int:
+        return hash((self.x, self.y))
+
+    # augmented assignments create new vectors like for tuples
+    def __iadd__(self, vector: Vector2d) -> "FrozenVector2d":
+        return self + vector
+
+    def __isub__(self, vector: Vector2d) -> "FrozenVector2d":
+        return self - vector
+
+    def __imul__(self, value: float) -> "FrozenVector2d":
+        return self * value
+
+    def __itruediv__(self, value: float) -> "FrozenVector2d":
+        return self / value
+
+
+def _to_doubles(values) -> array:
+    """
+    Copies values to a new array of doubles, NumPy arrays and buffers are copied as a single block.
+    @param values: iterable of floats
+    @return: array of doubles
+    """
+    array_view = as_ndarray(values)
+    if array_view is not None:
+        return array("d", array_view.astype(np.float64, copy=False).tobytes())
+    return array("d", values)
+
+
+class Vector2dView(Vector2d):
+    """
+    Vector2d reading and writing its coordinates directly in the buffers of a Vector2dArray.
+    """
+
+    __slots__ = ("_vectors", "_idx")
+
+    def __init__(self, vectors: "Vector2dArray", idx: int):
+        self._vectors: Vector2dArray = vectors
+        self._idx: int = idx
+
+    @property
+    def x(self) -> float:
+        return self._vectors.x[self._idx]
+
+    @x.setter
+    def x(self, value: float) -> None:
+        self._vectors.x[self._idx] = value
+
+    @property
+    def y(self) -> float:
+        return self._vectors.y[self._idx]
+
+    @y.setter
+    def y(self, value: float) -> None:
+        self._vectors.y[self._idx] = value
+
+
+class Vector2dArray:
+    """
+    Represents many 2D cartesian vectors stored as two contiguous arrays of doubles (struct of arrays).
+    The operations are vectorized by NumPy if it is installed, the buffers are shared with NumPy without copying.
+    """
+
+    def __init__(self, x=(), y=()):
+        """
+        @param x: iterable of x coordinates
+        @param y: iterable of y coordinates, the same count as x
+        """
+        self.x: array = _to_doubles(x)
+        self.y: array = _to_doubles(y)
+        if len(self.x) != len(self.y):
+            raise ValueError
+
+    @classmethod
+    def zeros(cls, count: int) -> "Vector2dArray":
+        """
+        Creates an array of zero vectors.
+        @param count: number of vectors
+        @return: new array of vectors
+        """
+        vectors: Vector2dArray = cls()
+        vectors.x = array("d", bytes(count * vectors.x.itemsize))
+        vectors.y = array("d", bytes(count * vectors.y.itemsize))
+        return vectors
+
+    @classmethod
+    def from_vectors(cls, vectors) -> "Vector2dArray":
+        """
+        Creates an array by copying coordinates of the given vectors.
+        @param vectors: iterable of Vector2d
+        @return: new array of vectors
+        """
+        vectors = list(vectors)
+        return cls(x=[vector.x for vector in vectors], y=[vector.y for vector in vectors])
+
+    def to_vectors(self) -> list[Vector2dView]:
+        """
+        Returns views of the vectors, changes of the views are written to the array.
+        @return: list of vectors
+        """
+        return [Vector2dView(self, idx) for idx in range(len(self))]
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def __getitem__(self, idx: int) -> Vector2dView:
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError
+        return Vector2dView(self, idx)
+
+    def __setitem__(self, idx: int, vector: Vector2d) -> None:
+        self.x[idx] = vector.x
+        self.y[idx] = vector.y
+
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield Vector2dView(self, idx)
+
+    def copy(self) -> "Vector2dArray":
+        """
+        Returns a copy of the array.
+        @return: new array containing the same coordinates
+        """
+        vectors: Vector2dArray = type(self)()
+        vectors.x = array("d", self.x)
+        vectors.y = array("d", self.y)
+        return vectors
+
+    def _apply(self, operation_name: str, operation, other_x, other_y, out: "Vector2dArray") -> None:
+        """
+        Applies elementwise binary operation to the coordinates and writes the results to out.
+        @param operation_name: name of the NumPy ufunc
+        @param operation: equivalent Python function of two floats
+        @param other_x: second operands of x coordinates, array of doubles of the same length or a float
+        @param other_y: second operands of y coordinates, array of doubles of the same length or a float
+        @param out: array of vectors to write the results to, can be self
+        @return: None
+        """
+        view_x = as_ndarray(self.x)
+        if view_x is not None:
+            ufunc = getattr(np, operation_name)
+            operand_x = as_ndarray(other_x) if isinstance(other_x, array) else other_x
+            operand_y = as_ndarray(other_y) if isinstance(other_y, array) else other_y
+            ufunc(view_x, operand_x, out=as_ndarray(out.x))
+            ufunc(as_ndarray(self.y), operand_y, out=as_ndarray(out.y))
+            return
+
+        operand_x = other_x if isinstance(other_x, array) else itertools.repeat(other_x)
+        operand_y = other_y if isinstance(other_y, array) else itertools.repeat(other_y)
+        out.x[:] = array("d", map(operation, self.x, operand_x))
+        out.y[:] = array("d", map(operation, self.y, operand_y))
+
+    def _check_length(self, vectors) -> None:
+        """
+        Raises ValueError if vectors is an array of vectors of different length.
+        @param vectors: Vector2dArray or a single Vector2d
+        @return: None
+        """
+        if isinstance(vectors, Vector2dArray) and len(vectors) != len(self):
+            raise ValueError
+
+    def norm(self) -> array:
+        """
+        Returns norms of the vectors.
+        @return: array of norms
+        """
+        norms: array = array("d", bytes(len(self) * self.x.itemsize))
+        view_x = as_ndarray(self.x)
+        if view_x is not None:
+            np.hypot(view_x, as_ndarray(self.y), out=as_ndarray(norms))
+        else:
+            norms[:] = array("d", map(math.hypot, self.x, self.y))
+        return norms
+
+    def squared_norm(self) -> array:
+        """
+        Returns squared norms of the vectors, cheaper than norm for comparisons.
+        @return: array of squared norms
+        """
+        squared_norms: array = array("d", bytes(len(self) * self.x.itemsize))
+        view_x = as_ndarray(self.x)
+        if view_x is not None:
+            view_y = as_ndarray(self.y)
+            np.add(view_x * view_x, view_y * view_y, out=as_ndarray(squared_norms))
+        else:
+            squared_norms[:] = array("d", (x * x + y * y for x, y in zip(self.x, self.y)))
+        return squared_norms
+
+    def normalize(self) -> None:
+        """
+        Normalizes the vectors in place, making them to have norm equal to one.
+        @return: None
+        """
+        norms: array = self.norm()
+        if 0.0 in norms:
+            raise ZeroDivisionError
+        self._apply("divide", operator.truediv, norms, norms, self)
+
+    def plus(self, vectors) -> "Vector2dArray":
+        """
+        Adds vectors elementwise and returns new array.
+        @param vectors: Vector2dArray of the same length or a single Vector2d added to all vectors
+        @return: new array of vectors
+        """
+        self._check_length(vectors)
+        result: Vector2dArray = Vector2dArray.zeros(len(self))
+        self._apply("add", operator.add, vectors.x, vectors.y, result)
+        return result
+
+    def plus_inplace(self, vectors) -> None:
+        """
+        Adds vectors elementwise to the current array.
+        @param vectors: Vector2dArray of the same length or a single Vector2d added to all vectors
+        @return: None
+        """
+        self._check_length(vectors)
+        self._apply("add", operator.add, vectors.x, vectors.y, self)
+
+    def minus(self, vectors) -> "Vector2dArray":
+        """
+        Subtracts vectors elementwise and returns new array.
+        @param vectors: Vector2dArray of the same length or a single Vector2d subtracted from all vectors
+        @return: new array of vectors
+        """
+        self._check_length(vectors)
+        result: Vector2dArray = Vector2dArray.zeros(len(self))
+        self._apply("subtract", operator.sub, vectors.x, vectors.y, result)
+        return result
+
+    def minus_inplace(self, vectors) -> None:
+        """
+        Subtracts vectors elementwise from the current array.
+        @param vectors: Vector2dArray of the same length or a single Vector2d subtracted from all vectors
+        @return: None
+        """
+        self._check_length(vectors)
+        self._apply("subtract", operator.sub, vectors.x, vectors.y, self)
+
+    def multiply(self, value: float) -> "Vector2dArray":
+        """
+        Multiplies the vectors by the given value and returns new array.
+        @param value: scalar value to multiply the vectors with
+        @return: new array of vectors
+        """
+        result: Vector2dArray = Vector2dArray.zeros(len(self))
+        self._apply("multiply", operator.mul, value, value, result)
+        return result
+
+    def multiply_inplace(self, value: float) -> None:
+        """
+        Multiplies the vectors by the given value in place.
+        @param value: scalar value to multiply the vectors with
+        @return: None
+        """
+        self._apply("multiply", operator.mul, value, value, self)
+
+    def divide(self, value: float) -> "Vector2dArray":
+        """
+        Divides the vectors by the given value and returns new array.
+        @param value: scalar nonzero value
+        @return: new array of vectors
+        """
+        if value == 0.0:
+            raise ZeroDivisionError
+
+        return self.multiply(1.0 / value)
+
+    def divide_inplace(self, value: float) -> None:
+        """
+        Divides the vectors by the given value in place.
+        @param value: scalar nonzero value
+        @return: None
+        """
+        if value == 0.0:
+            raise ZeroDivisionError
+
+        self.multiply_inplace(1.0 / value)
+
+    def distance(self, vectors) -> array:
+        """
+        Calculates distances between the vectors and the given vectors elementwise.
+        @param vectors: Vector2dArray of the same length or a single Vector2d
+        @return: array of distances
+        """
+        return self.minus(vectors).norm()
+
+    def cross_distance(self, vectors: "Vector2dArray") -> array:
+        """
+        Calculates distances between all pairs of the vectors and the given vectors.
+        @param vectors: other array of vectors
+        @return: flat array of distances, distance of self[i] and vectors[j] is at index i * len(vectors) + j
+        """
+        distances: array = array("d", bytes(len(self) * len(vectors) * self.x.itemsize))
+        view_x = as_ndarray(self.x)
+        if view_x is not None:
+            other_x, other_y = as_ndarray(vectors.x), as_ndarray(vectors.y)
+            np.hypot(np.subtract.outer(view_x, other_x), np.subtract.outer(as_ndarray(self.y), other_y),
+                     out=as_ndarray(distances).reshape(len(self), len(vectors)))
+            return distances
+
+        idx: int = 0
+        for x, y in zip(self.x, self.y):
+            for other_x, other_y in zip(vectors.x, vectors.y):
+                distances[idx] = math.hypot(x - other_x, y - other_y)
+                idx += 1
+        return distances
+
+
+def _as_vector_array(points) -> Vector2dArray:
+    """
+    Returns the points as Vector2dArray, iterables of Vector2d are copied.
+    @param points: Vector2dArray or iterable of Vector2d
+    @return: array of vectors
+    """
+    if isinstance(points, Vector2dArray):
+        return points
+    return Vector2dArray.from_vectors(points)
+
 
 class Circle:
     """
     Represents a circle on the plane.
     """
 
+    __slots__ = ("center", "radius")
+
     def __init__(self, center: Vector2d = None, radius: float = None):
 
         if center is None:
@@ -151,31 +586,108 @@ class Circle:
         @param point: a point on the plain
         @return: True if it is inside the circle else False
         """
-        return self.distance_from_center(point) < self.radius
+        dx: float = point.x - self.center.x
+        dy: float = point.y - self.center.y
+        return dx * dx + dy * dy < self.radius * self.radius
 
-    def is_on_boundary(self, point: Vector2d) -> bool:
+    def _boundary_bounds(self, tolerance: float) -> tuple[float, float]:
+        """
+        Returns squared distances from the center bounding the boundary with the given tolerance.
+        @param tolerance: allowed absolute difference between the distance from the center and the radius
+        @return: lower and upper bound of squared distance
+        """
+        lower: float = max(self.radius - tolerance, 0.0)
+        upper: float = self.radius + tolerance
+        return lower * lower, upper * upper
+
+    def is_on_boundary(self, point: Vector2d, tolerance: float = 1e-9) -> bool:
         """
         Checks if the point is on the boundary of the circle.
         @param point: a point on the plain
+        @param tolerance: allowed absolute difference between the distance from the center and the radius
         @return: True if it is on the boundary else False
         """
-        return self.distance_from_center(point) == self.radius
+        dx: float = point.x - self.center.x
+        dy: float = point.y - self.center.y
+        lower, upper = self._boundary_bounds(tolerance)
+        return lower <= dx * dx + dy * dy <= upper
 
-    def nearest_point_on(self, point: Vector2d) -> Vector2d:
+    def nearest_point_on(self, point: Vector2d, out: Vector2d | None = None) -> Vector2d:
         """
         Finds the nearest point on the circle from the given point.
         @param point: a point on the plain
+        @param out: vector to write the result to instead of creating new one, can be point
         @return: closest point on the circle
         """
+        dx: float = point.x - self.center.x
+        dy: float = point.y - self.center.y
+        distance: float = math.hypot(dx, dy)
 
         # check if input point is the center
-        if self.center.is_equal(point):
+        if distance == 0.0:
             raise Exception
 
-        direction: Vector2d = point.minus(self.center)
-        direction.normalize()
+        scale: float = self.radius / distance
+        x_new: float = self.center.x + dx * scale
+        y_new: float = self.center.y + dy * scale
+        if out is None:
+            return Vector2d(x=x_new, y=y_new)
+        out.x = x_new
+        out.y = y_new
+        return out
+
+    def contains(self, points) -> array:
+        """
+        Checks which points are inside the circle, compares squared distances without sqrt.
+        @param points: Vector2dArray or iterable of Vector2d
+        @return: array of 1 for points inside the circle and 0 for the others
+        """
+        squared_distances: array = _as_vector_array(points).minus(self.center).squared_norm()
+        squared_radius: float = self.radius * self.radius
+
+        flags: array = array("b", bytes(len(squared_distances)))
+        distances_view = as_ndarray(squared_distances)
+        if distances_view is not None:
+            np.less(distances_view, squared_radius, out=as_ndarray(flags).view(np.bool_))
+        else:
+            flags[:] = array("b", (distance < squared_radius for distance in squared_distances))
+        return flags
+
+    def on_boundary(self, points, tolerance: float = 1e-9) -> array:
+        """
+        Checks which points are on the boundary of the circle, compares squared distances without sqrt.
+        @param points: Vector2dArray or iterable of Vector2d
+        @param tolerance: allowed absolute difference between the distance from the center and the radius
+        @return: array of 1 for points on the boundary and 0 for the others
+        """
+        squared_distances: array = _as_vector_array(points).minus(self.center).squared_norm()
+        lower, upper = self._boundary_bounds(tolerance)
 
-        return direction.multiply(self.radius).plus(self.center)
+        flags: array = array("b", bytes(len(squared_distances)))
+        distances_view = as_ndarray(squared_distances)
+        if distances_view is not None:
+            np.logical_and(distances_view >= lower, distances_view <= upper,
+                           out=as_ndarray(flags).view(np.bool_))
+        else:
+            flags[:] = array("b", (lower <= distance <= upper for distance in squared_distances))
+        return flags
+
+    def nearest_points_on(self, points) -> Vector2dArray:
+        """
+        Finds the nearest points on the circle from the given points.
+        @param points: Vector2dArray or iterable of Vector2d, none of them in the center
+        @return: array of closest points on the circle
+        """
+        directions: Vector2dArray = _as_vector_array(points).minus(self.center)
+        # only a point in the center has zero direction
+        try:
+            directions.normalize()
+        except ZeroDivisionError:
+            raise Exception
+
+        directions.multiply_inplace(self.radius)
+        directions.plus_inplace(self.center)
+        return directions
 
     def to_string(self) -> str:
         """
@@ -192,3 +704,242 @@ class Circle:
         @return: None
         """
         print(self.to_string())
+
+
+class CircleIndex:
+    """
+    Uniform grid over many circles. Every circle is registered in all cells overlapped by its bounding box,
+    queries examine only the cells near the point instead of all circles.
+    """
+
+    def __init__(self, circles=(), cell_size: float | None = None):
+        """
+        @param circles: iterable of circles loaded at once
+        @param cell_size: side of a grid cell, chosen from the radii of the loaded circles if None
+        """
+        self.cell_size: float | None = cell_size
+        # circles keyed by id, the circles are compared by identity
+        self._circles: dict[int, Circle] = {}
+        # cell ranges at insertion keyed by id, removal does not depend on later changes of the circles
+        self._circle_cells: dict[int, tuple[int, int, int, int]] = {}
+        self._cells: dict[tuple[int, int], list[Circle]] = {}
+        # range of occupied cells, it is not shrunk by removals
+        self._cell_min: list[int] = [0, 0]
+        self._cell_max: list[int] = [-1, -1]
+        self.bulk_load(circles)
+
+    def __len__(self) -> int:
+        return len(self._circles)
+
+    def _cell_of(self, x: float, y: float) -> tuple[int, int]:
+        """
+        Returns the cell containing the point.
+        @param x:
+        @param y:
+        @return: column and row of the cell
+        """
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    def _cells_of(self, circle: Circle):
+        """
+        Generates cells the circle was registered in.
+        @param circle: circle in the index
+        @return: generator of cells
+        """
+        column_min, row_min, column_max, row_max = self._circle_cells[id(circle)]
+        for column in range(column_min, column_max + 1):
+            for row in range(row_min, row_max + 1):
+                yield column, row
+
+    def bulk_load(self, circles) -> None:
+        """
+        Adds many circles at once. The cell size of an empty index without the given cell size
+        is set to the mean diameter of the circles, so a typical circle overlaps a few cells.
+        @param circles: iterable of circles
+        @return: None
+        """
+        circles = list(circles)
+        if not circles:
+            return
+
+        # the whole batch is validated first, a duplicate does not leave the index partially loaded
+        batch_ids: set[int] = set()
+        for circle in circles:
+            if id(circle) in self._circles or id(circle) in batch_ids:
+                raise ValueError
+            batch_ids.add(id(circle))
+
+        if self.cell_size is None:
+            mean_diameter: float = 2.0 * math.fsum(circle.radius for circle in circles) / len(circles)
+            self.cell_size = mean_diameter if mean_diameter > 0.0 else 1.0
+
+        # the loop runs for every circle, attribute lookups are kept out of it
+        indexed_circles: dict[int, Circle] = self._circles
+        circle_cells: dict[int, tuple[int, int, int, int]] = self._circle_cells
+        cells: dict[tuple[int, int], list[Circle]] = self._cells
+        cell_size: float = self.cell_size
+        floor = math.floor
+        if self._cell_min[0] > self._cell_max[0]:
+            column_low, row_low = math.inf, math.inf
+            column_high, row_high = -math.inf, -math.inf
+        else:
+            (column_low, row_low), (column_high, row_high) = self._cell_min, self._cell_max
+
+        for circle in circles:
+            indexed_circles[id(circle)] = circle
+
+            x: float = circle.center.x
+            y: float = circle.center.y
+            radius: float = circle.radius
+            column_min: int = floor((x - radius) / cell_size)
+            column_max: int = floor((x + radius) / cell_size)
+            row_min: int = floor((y - radius) / cell_size)
+            row_max: int = floor((y + radius) / cell_size)
+            circle_cells[id(circle)] = column_min, row_min, column_max, row_max
+            for column in range(column_min, column_max + 1):
+                for row in range(row_min, row_max + 1):
+                    cell_circles = cells.get((column, row))
+                    if cell_circles is None:
+                        cells[column, row] = [circle]
+                    else:
+                        cell_circles.append(circle)
+
+            column_low = min(column_low, column_min)
+            row_low = min(row_low, row_min)
+            column_high = max(column_high, column_max)
+            row_high = max(row_high, row_max)
+
+        self._cell_min = [column_low, row_low]
+        self._cell_max = [column_high, row_high]
+
+    def insert(self, circle: Circle) -> None:
+        """
+        Adds the circle to the index.
+        @param circle:
+        @return: None
+        """
+        if self.cell_size is None:
+            self.cell_size = 2.0 * circle.radius if circle.radius > 0.0 else 1.0
+        self.bulk_load((circle,))
+
+    def remove(self, circle: Circle) -> None:
+        """
+        Removes the circle from the index.
+        @param circle: circle previously added to the index
+        @return: None
+        """
+        if self._circles.pop(id(circle), None) is None:
+            raise ValueError
+
+        for cell in self._cells_of(circle):
+            cell_circles = self._cells[cell]
+            for idx, cell_circle in enumerate(cell_circles):
+                if cell_circle is circle:
+                    del cell_circles[idx]
+                    break
+            if not cell_circles:
+                del self._cells[cell]
+        del self._circle_cells[id(circle)]
+
+    def circles_containing(self, point: Vector2d) -> list[Circle]:
+        """
+        Finds all circles with the point inside, same condition as Circle.is_inside.
+        @param point: a point on the plain
+        @return: list of circles
+        """
+        if not self._circles:
+            return []
+
+        results: list[Circle] = []
+        for circle in self._cells.get(self._cell_of(point.x, point.y), ()):
+            dx: float = point.x - circle.center.x
+            dy: float = point.y - circle.center.y
+            if dx * dx + dy * dy < circle.radius * circle.radius:
+                results.append(circle)
+        return results
+
+    def any_contains(self, points) -> array:
+        """
+        Checks which points are inside at least one circle.
+        @param points: Vector2dArray or iterable of Vector2d
+        @return: array of 1 for points inside a circle and 0 for the others
+        """
+        points = _as_vector_array(points)
+        flags: array = array("b", bytes(len(points)))
+        if not self._circles:
+            return flags
+
+        cells: dict[tuple[int, int], list[Circle]] = self._cells
+        for idx, (x, y) in enumerate(zip(points.x, points.y)):
+            for circle in cells.get(self._cell_of(x, y), ()):
+                dx: float = x - circle.center.x
+                dy: float = y - circle.center.y
+                if dx * dx + dy * dy < circle.radius * circle.radius:
+                    flags[idx] = 1
+                    break
+        return flags
+
+    def nearest_circle(self, point: Vector2d) -> Circle | None:
+        """
+        Finds the circle with the nearest boundary, the distance to the boundary is |d - r| for a point
+        in distance d from the center of a circle of radius r. Rings of cells around the point are examined
+        until no unexamined circle can be nearer than the best one.
+        @param point: a point on the plain
+        @return: circle with the nearest boundary or None if the index is empty
+        """
+        if not self._circles:
+            return None
+
+        column, row = self._cell_of(point.x, point.y)
+        # number of rings covering all occupied cells
+        max_ring: int = max(column - self._cell_min[0], self._cell_max[0] - column,
+                            row - self._cell_min[1], self._cell_max[1] - row, 0)
+
+        best_circle: Circle | None = None
+        best_distance: float = float("inf")
+        seen: set[int] = set()
+        for ring in range(max_ring + 1):
+            # circles outside the rings examined so far are at least ring - 1 cells far away
+            if best_distance <= (ring - 1) * self.cell_size:
+                break
+
+            # far from the circles the empty rings are more expensive than checking all circles
+            if 8 * ring > len(self._circles):
+                ring_circles = self._circles.values()
+            else:
+                ring_circles = (circle for cell in _ring_cells(column, row, ring)
+                                for circle in self._cells.get(cell, ()))
+
+            for circle in ring_circles:
+                if id(circle) in seen:
+                    continue
+                seen.add(id(circle))
+                distance: float = abs(math.hypot(point.x - circle.center.x, point.y - circle.center.y)
+                                      - circle.radius)
+                if distance < best_distance:
+                    best_circle = circle
+                    best_distance = distance
+
+            if len(seen) == len(self._circles):
+                break
+        return best_circle
+
+
+def _ring_cells(column: int, row: int, ring: int):
+    """
+    Generates cells on the square ring of the given distance around the cell.
+    @param column: column of the center cell
+    @param row: row of the center cell
+    @param ring: Chebyshev distance of the ring cells from the center cell
+    @return: generator of cells
+    """
+    if ring == 0:
+        yield column, row
+        return
+
+    for column_now in range(column - ring, column + ring + 1):
+        yield column_now, row - ring
+        yield column_now, row + ring
+    for row_now in range(row - ring + 1, row + ring):
+        yield column - ring, row_now
+        yield column + ring, row_now
@@ -1,22 +1,139 @@
-def _locate_pivot(lst: list[float], idx_start: int, idx_end: int) -> int:
+import heapq
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from .backend import as_ndarray
+
+# partitions of this size or smaller are sorted by insertion sort
+_INSERTION_SORT_THRESHOLD: int = 16
+# partitions larger than this use the ninther (median of three medians) as the pivot
+_NINTHER_THRESHOLD: int = 128
+# shorter lists are not worth starting worker processes
+_PARALLEL_THRESHOLD: int = 100_000
+
+
+def _insertion_sort(lst: list[float], idx_start: int, idx_end: int) -> None:
+    """
+    Insertion sort of the part of the list, fast for short partitions.
+    :param lst: examined list
+    :param idx_start: the first index of the examined list
+    :param idx_end: the last index of the examined list
+    :return: None
+    """
+    for idx_now in range(idx_start + 1, idx_end + 1):
+        value: float = lst[idx_now]
+        idx_place: int = idx_now - 1
+        while idx_place >= idx_start and lst[idx_place] > value:
+            lst[idx_place + 1] = lst[idx_place]
+            idx_place -= 1
+        lst[idx_place + 1] = value
+
+
+def _sift_down(lst: list[float], idx_start: int, idx_root: int, heap_size: int) -> None:
+    """
+    Moves the value at the root down the max-heap stored in the part of the list.
+    :param lst: examined list
+    :param idx_start: index where the heap starts
+    :param idx_root: position of the root relative to idx_start
+    :param heap_size: number of values in the heap
+    :return: None
+    """
+    value: float = lst[idx_start + idx_root]
+    while True:
+        idx_child: int = 2 * idx_root + 1
+        if idx_child >= heap_size:
+            break
+        if idx_child + 1 < heap_size and lst[idx_start + idx_child + 1] > lst[idx_start + idx_child]:
+            idx_child += 1
+        if lst[idx_start + idx_child] <= value:
+            break
+        lst[idx_start + idx_root] = lst[idx_start + idx_child]
+        idx_root = idx_child
+    lst[idx_start + idx_root] = value
+
+
+def _heap_sort(lst: list[float], idx_start: int, idx_end: int) -> None:
+    """
+    Heap sort of the part of the list, guarantees O(n log n) when quick sort degenerates.
+    :param lst: examined list
+    :param idx_start: the first index of the examined list
+    :param idx_end: the last index of the examined list
+    :return: None
+    """
+    heap_size: int = idx_end - idx_start + 1
+    for idx_root in range(heap_size // 2 - 1, -1, -1):
+        _sift_down(lst, idx_start, idx_root, heap_size)
+
+    for idx_last in range(heap_size - 1, 0, -1):
+        # move the maximum to the end and restore the heap
+        lst[idx_start], lst[idx_start + idx_last] = lst[idx_start + idx_last], lst[idx_start]
+        _sift_down(lst, idx_start, 0, idx_last)
+
+
+def _median_of_three(lst: list[float], idx_a: int, idx_b: int, idx_c: int) -> int:
+    """
+    Returns the index of the median of three values.
+    :param lst: examined list
+    :param idx_a: index of the first value
+    :param idx_b: index of the second value
+    :param idx_c: index of the third value
+    :return: index of the median value
+    """
+    value_a, value_b, value_c = lst[idx_a], lst[idx_b], lst[idx_c]
+    if value_a < value_b:
+        if value_b < value_c:
+            return idx_b
+        return idx_c if value_a < value_c else idx_a
+    if value_a < value_c:
+        return idx_a
+    return idx_c if value_b < value_c else idx_b
+
+
+def _select_pivot(lst: list[float], idx_start: int, idx_end: int) -> float:
     """
-    Moves pivot to the proper place in list and returns its index.
+    Selects the pivot value as the median of three or, for large partitions, as the ninther.
     :param lst: examined list
     :param idx_start: the first index of the examined list
     :param idx_end: the last index of the examined list
-    :return: index of pivot
+    :return: pivot value
     """
-    # pivot is always the last value in the list
-    pivot_value: float = lst[idx_end]
+    idx_middle: int = (idx_start + idx_end) // 2
+    if idx_end - idx_start + 1 <= _NINTHER_THRESHOLD:
+        return lst[_median_of_three(lst, idx_start, idx_middle, idx_end)]
 
-    idx_place: int = idx_start
-    for idx_now in range(idx_start, idx_end):
-        if lst[idx_now] <= pivot_value:
-            lst[idx_now], lst[idx_place] = lst[idx_place], lst[idx_now]
-            idx_place += 1
+    step: int = (idx_end - idx_start + 1) // 8
+    idx_first: int = _median_of_three(lst, idx_start, idx_start + step, idx_start + 2 * step)
+    idx_second: int = _median_of_three(lst, idx_middle - step, idx_middle, idx_middle + step)
+    idx_third: int = _median_of_three(lst, idx_end - 2 * step, idx_end - step, idx_end)
+    return lst[_median_of_three(lst, idx_first, idx_second, idx_third)]
 
-    lst[idx_end], lst[idx_place] = lst[idx_place], lst[idx_end]
-    return idx_place
+
+def _partition_three_way(lst: list[float], idx_start: int, idx_end: int, pivot_value: float) -> tuple[int, int]:
+    """
+    Splits the part of the list into values smaller than, equal to and larger than the pivot (Dutch flag).
+    :param lst: examined list
+    :param idx_start: the first index of the examined list
+    :param idx_end: the last index of the examined list
+    :param pivot_value: value to split by
+    :return: the first and the last index of the values equal to the pivot
+    """
+    idx_lower: int = idx_start
+    idx_now: int = idx_start
+    idx_upper: int = idx_end
+    while idx_now <= idx_upper:
+        value: float = lst[idx_now]
+        if value < pivot_value:
+            lst[idx_lower], lst[idx_now] = value, lst[idx_lower]
+            idx_lower += 1
+            idx_now += 1
+        elif value > pivot_value:
+            lst[idx_upper], lst[idx_now] = value, lst[idx_upper]
+            idx_upper -= 1
+        else:
+            idx_now += 1
+    return idx_lower, idx_upper
 
 
 def quick_sort(
@@ -24,12 +141,23 @@ def quick_sort(
         idx_start: int = 0,
         idx_end: int | None = None) -> None:
     """
-    Quick sort sorting algorithm.
+    Quick sort sorting algorithm (introsort variant). Uses median-of-three/ninther pivots,
+    three-way partitioning, insertion sort for small partitions and heap sort when the
+    partitioning goes too deep. Explicit stack keeps the memory O(log n).
+    NumPy arrays and buffer-protocol objects are sorted in place by NumPy if it is installed.
     :param lst: list to sort
     :param idx_start: the first index of the examined list
     :param idx_end: the last index of the examined list
     :return:
     """
+    array_view = as_ndarray(lst)
+    if array_view is not None:
+        if idx_end is None:
+            idx_end = len(array_view) - 1
+        # sorting the view sorts the shared memory
+        array_view[idx_start:idx_end + 1].sort()
+        return
+
     if not lst:
         return
 
@@ -40,7 +168,98 @@ def quick_sort(
     if idx_start >= idx_end:
         return
 
-    idx_pivot: int = _locate_pivot(lst, idx_start, idx_end)
+    # depth limit 2*log2(n), deeper partitioning is considered degenerate
+    max_depth: int = 2 * (idx_end - idx_start + 1).bit_length()
+    stack: list[tuple[int, int, int]] = [(idx_start, idx_end, max_depth)]
+
+    while stack:
+        idx_low, idx_high, depth = stack.pop()
+
+        while idx_high - idx_low + 1 > _INSERTION_SORT_THRESHOLD:
+            if depth == 0:
+                _heap_sort(lst, idx_low, idx_high)
+                break
+            depth -= 1
+
+            pivot_value: float = _select_pivot(lst, idx_low, idx_high)
+            idx_lower, idx_upper = _partition_three_way(lst, idx_low, idx_high, pivot_value)
+
+            # postpone the larger side, continue with the smaller one
+            if idx_lower - idx_low < idx_high - idx_upper:
+                stack.append((idx_upper + 1, idx_high, depth))
+                idx_high = idx_lower - 1
+            else:
+                stack.append((idx_low, idx_lower - 1, depth))
+                idx_low = idx_upper + 1
+        else:
+            _insertion_sort(lst, idx_low, idx_high)
+
+
+def _sort_shared_chunk(shm_name: str, idx_start: int, idx_end: int) -> None:
+    """
+    Sorts a chunk of doubles stored in the shared memory block, runs in a worker process.
+    :param shm_name: name of the shared memory block
+    :param idx_start: the first index of the chunk
+    :param idx_end: index after the last value of the chunk
+    :return: None
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    values = shm.buf.cast("d")
+    try:
+        # sorted in place in the shared memory, by NumPy if it is installed
+        quick_sort(values, idx_start, idx_end - 1)
+    finally:
+        # views must be released before the block is closed
+        values.release()
+        shm.close()
+
+
+def parallel_sort(lst: list[float], workers: int | None = None) -> None:
+    """
+    Sorts the list in place on multiple cores. The values are copied once into shared memory as doubles,
+    chunks are sorted by quick_sort in worker processes and then merged by k-way merge.
+    Only lists of floats are sorted in parallel, they pass through the doubles unchanged;
+    other lists, short lists and a single worker use the serial quick_sort.
+    :param lst: list to sort
+    :param workers: number of worker processes, all available cores if None
+    :return: None
+    """
+    if as_ndarray(lst) is not None:
+        # NumPy sorts arrays faster than the process pool could
+        quick_sort(lst)
+        return
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    num_values: int = len(lst)
+    if workers < 2 or num_values < _PARALLEL_THRESHOLD:
+        quick_sort(lst)
+        return
+
+    if any(not isinstance(value, float) for value in lst):
+        # other values would not survive the round trip through the doubles unchanged
+        quick_sort(lst)
+        return
+
+    shm = shared_memory.SharedMemory(create=True, size=num_values * array("d").itemsize)
+    values = shm.buf.cast("d")
+    chunks: list[memoryview] = []
+    try:
+        values[:num_values] = array("d", lst)
+
+        bounds: list[int] = [num_values * idx // workers for idx in range(workers + 1)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_sort_shared_chunk, shm.name, bounds[idx], bounds[idx + 1])
+                       for idx in range(workers)]
+            for future in futures:
+                future.result()
 
-    quick_sort(lst, idx_start, idx_pivot - 1)
-    quick_sort(lst, idx_pivot + 1, idx_end)
+        chunks = [values[bounds[idx]:bounds[idx + 1]] for idx in range(workers)]
+        lst[:] = heapq.merge(*chunks)
+    finally:
+        for chunk in chunks:
+            chunk.release()
+        values.release()
+        shm.close()
+        shm.unlink()